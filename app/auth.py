@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -8,6 +9,7 @@ from app.config import settings
 
 # Security scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 class TokenData(BaseModel):
@@ -129,4 +131,87 @@ async def verify_api_key_header(x_api_key: str = Header(...)) -> str:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Noto'g'ri API key"
         )
-    return x_api_key
\ No newline at end of file
+    return x_api_key
+
+
+async def get_admin_user(
+        current_user: TokenData = Depends(get_current_user)
+) -> TokenData:
+    """
+    Admin foydalanuvchini tekshirish (JWT orqali)
+
+    Args:
+        current_user: Joriy foydalanuvchi (JWT dan)
+
+    Returns:
+        TokenData obyekti
+
+    Raises:
+        HTTPException: API key admin ro'yxatida bo'lmasa
+    """
+    if current_user.api_key not in settings.ADMIN_API_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin huquqi talab qilinadi"
+        )
+    return current_user
+
+
+def owner_id(identity: str) -> str:
+    """
+    Foydalanuvchi identifikatoridan (API key) tarix kaliti uchun hash olish
+
+    Args:
+        identity: API key yoki JWT subject
+
+    Returns:
+        Redis kalitlarida ishlatiladigan qisqa hash
+    """
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+async def get_optional_owner(
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+        x_api_key: Optional[str] = Header(None)
+) -> Optional[str]:
+    """
+    So'rov egasini aniqlash (JWT yoki X-API-Key), autentifikatsiya ixtiyoriy
+
+    Args:
+        credentials: HTTP Authorization credentials (bo'lmasligi mumkin)
+        x_api_key: X-API-Key header qiymati (bo'lmasligi mumkin)
+
+    Returns:
+        Egasining hash identifikatori yoki None
+
+    Raises:
+        HTTPException: Token yoki API key yaroqsiz bo'lsa
+    """
+    if credentials is not None:
+        token_data = verify_token(credentials.credentials)
+        return owner_id(token_data.api_key or token_data.username)
+    if x_api_key is not None:
+        return owner_id(await verify_api_key_header(x_api_key))
+    return None
+
+
+async def get_owner(owner: Optional[str] = Depends(get_optional_owner)) -> str:
+    """
+    So'rov egasini olish, autentifikatsiya majburiy
+
+    Args:
+        owner: get_optional_owner natijasi
+
+    Returns:
+        Egasining hash identifikatori
+
+    Raises:
+        HTTPException: JWT ham, X-API-Key ham berilmagan bo'lsa
+    """
+    if owner is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Autentifikatsiya talab qilinadi",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return owner
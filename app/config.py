@@ -5,6 +5,7 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     RESULT_BACKEND: str = "redis://localhost:6379/0"
     STORAGE_PATH: str = "./storage"
+    SPEC_PATH: str = "./specs"  # slayd spec va lock fayllari (/download orqali berilmaydi)
     OPENAI_API_KEY: str = ""
 
     SECRET_KEY: str = "your-secret-key-change-this-in-production-09876543210"
@@ -16,6 +17,56 @@ class Settings(BaseSettings):
         "demo-api-key-12345",  # Demo key
         "client-api-key-67890"  # Client key
     ]
+
+    # Prometheus exporter porti (Celery worker uchun, 0 = o'chirilgan)
+    WORKER_METRICS_PORT: int = 9808
+
+    # Tracing: none, console, file, memory yoki otlp
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = "./traces.jsonl"
+
+    # Admin endpointlari uchun API keylar
+    ADMIN_API_KEYS: list = []
+
+    # Task profiling (faqat yoqilganda ishlaydi)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # tasklarning qancha qismi (0.0 - 1.0)
+    PROFILING_LATENCY_THRESHOLD: float = 0.0  # sekund, 0 = o'chirilgan
+    PROFILING_INTERVAL_MS: float = 5.0
+
+    # Readiness tekshiruvlari (/ready, /health/deep)
+    READINESS_CACHE_TTL: float = 5.0  # sekund
+    READINESS_REFRESH_INTERVAL: float = 2.0  # sekund
+    READINESS_CHECK_TIMEOUT: float = 1.0  # sekund
+    READINESS_MIN_FREE_BYTES: int = 100 * 1024 * 1024
+
+    # IMAGE slaydlar uchun rasmlar (yuklab olish, kesh, kichraytirish)
+    IMAGE_CACHE_PATH: str = "./cache/images"  # workerlar orasida umumiy bo'lishi mumkin
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    IMAGE_CACHE_TTL: int = 3600  # sekund, keyin http(s) rasm ETag/Last-Modified bilan qayta tekshiriladi, 0 = hech qachon
+    IMAGE_FETCH_CONCURRENCY: int = 16
+    IMAGE_FETCH_TIMEOUT: float = 10.0  # sekund
+    IMAGE_MAX_BYTES: int = 20 * 1024 * 1024  # bitta rasm uchun maksimal hajm
+    IMAGE_MAX_WIDTH: int = 1600  # slayd o'lchamiga mos piksel
+    IMAGE_MAX_HEIGHT: int = 1200
+    IMAGE_RECOMPRESS_BYTES: int = 1024 * 1024  # bundan kattalari qayta siqiladi
+    IMAGE_JPEG_QUALITY: int = 85
+    IMAGE_LOCAL_ROOT: str = ""  # lokal fayllar uchun ruxsat etilgan papka, bo'sh = o'chirilgan
+    IMAGE_ALLOW_PRIVATE_HOSTS: bool = False  # localhost/ichki tarmoq manzillaridan rasm olish (faqat development)
+
+    # Katta prezentatsiyalar: slaydlar bo'laklab parallel jarayonlarda yaratiladi
+    LARGE_DECK_THRESHOLD: int = 300  # slaydlar soni, 0 = o'chirilgan
+    LARGE_DECK_CHUNK_SIZE: int = 100
+    LARGE_DECK_PROCESSES: int = 2  # bitta task uchun jarayonlar, CPU soni / worker concurrency dan oshmasin; 0 = CPU soni
+
+    # PDF matni LLM ga yuborilishidan oldin shu token miqdoriga siqiladi
+    LLM_INPUT_TOKEN_BUDGET: int = 8000
+
+    # Kichik prezentatsiyalar API jarayonining o'zida yaratiladi (Celery navbatisiz)
+    INLINE_MAX_SLIDES: int = 0  # shundan kam slaydlar avtomatik inline, 0 = faqat ?sync=true (inline yaratish API jarayonining CPU sini oladi)
+    INLINE_WORKERS: int = 2  # bir vaqtda inline yaratishlar soni, 0 = o'chirilgan
+    INLINE_TIMEOUT: float = 2.0  # sekund, undan keyin javob task_id bilan qaytadi
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,102 @@
+"""
+Slide-level edits of generated decks.
+
+An edit is diffed against the stored slide spec; only a changed slide is
+rendered (alone, in a throwaway one-slide deck) and spliced into the existing
+package with ``PackageEditor``. The rest of the deck is copied without being
+parsed or re-rendered, so the cost follows the size of the change rather than
+the size of the deck.
+"""
+import logging
+import os
+import tempfile
+from typing import Optional
+
+from app.deck_store import deck_lock, deck_path, load_owner, load_spec, save_spec
+from app.metrics import STAGE_DURATION
+from app.models import SlideContent
+from app.ppt_generator import PPTGenerator
+from app.pptx_package import PackageEditor, PptxPackage
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("replace", "insert", "delete")
+
+# Deck slide 0 is the generated title slide; spec slide i is deck slide i + 1
+TITLE_SLIDES = 1
+
+
+class DeckEditor:
+    def __init__(self, presentation_id: str):
+        self.presentation_id = presentation_id
+        self.generator = PPTGenerator()
+
+    def apply(self, operation: str, index: int, slide: Optional[SlideContent] = None) -> bool:
+        """
+        Apply one edit under the deck lock.
+
+        Returns False when the edit does not change the deck (nothing is written).
+        Raises LookupError for unknown decks and IndexError for bad indexes.
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation {operation}")
+        if operation != "delete" and slide is None:
+            raise ValueError(f"{operation} needs a slide")
+
+        with deck_lock(self.presentation_id):
+            spec = load_spec(self.presentation_id)
+            path = deck_path(self.presentation_id)
+            if spec is None or not os.path.exists(path):
+                raise LookupError(f"Presentation {self.presentation_id} not found")
+
+            slides = list(spec.slides)
+            upper = len(slides) if operation == "insert" else len(slides) - 1
+            if not 0 <= index <= upper:
+                raise IndexError(f"Slide index {index} out of range")
+            if operation == "replace" and slides[index] == slide:
+                logger.info(f"Slide {index} of {self.presentation_id} unchanged, skipping")
+                return False
+
+            with tracer.start_as_current_span(
+                "deck_edit", attributes={"edit.operation": operation, "slide.index": index}
+            ):
+                self._rewrite(path, operation, index, slide)
+
+            if operation == "replace":
+                slides[index] = slide
+            elif operation == "insert":
+                slides.insert(index, slide)
+            else:
+                del slides[index]
+            save_spec(
+                self.presentation_id, spec.model_copy(update={"slides": slides}), load_owner(self.presentation_id)
+            )
+        return True
+
+    def _rewrite(self, path: str, operation: str, index: int, slide: Optional[SlideContent]):
+        source = None
+        if slide is not None:
+            source = PptxPackage(self.generator.render_slides([slide], first_index=index))
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".pptx")
+        os.close(fd)
+        try:
+            with PackageEditor(path) as editor:
+                position = index + TITLE_SLIDES
+                if operation == "replace":
+                    editor.replace_slide(position, source)
+                elif operation == "insert":
+                    editor.insert_slide(position, source)
+                else:
+                    editor.delete_slide(position)
+                with STAGE_DURATION.labels("save").time():
+                    editor.save(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        finally:
+            if source is not None:
+                source.close()
@@ -0,0 +1,124 @@
+"""
+Where generated decks and their slide specs live.
+
+Every deck is stored as ``<presentation_id>.pptx`` under ``STORAGE_PATH``,
+which is served publicly at ``/download``. Its slide spec, the
+``PresentationRequest`` it was rendered from plus the owner allowed to edit
+it, is ``<presentation_id>.json`` under ``SPEC_PATH``, which is not served.
+Edits take ``deck_lock`` so concurrent edits of one deck are applied one
+after another. Kept free of python-pptx so the API can import it.
+"""
+import fcntl
+import json
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+from app.config import settings
+from app.models import PresentationRequest
+
+# Lock files shared by all decks; two decks on one stripe just edit one after another
+LOCK_STRIPES = 64
+
+
+def validate_id(presentation_id: str) -> str:
+    """Presentation ids are UUIDs; anything else could escape STORAGE_PATH"""
+    return str(uuid.UUID(presentation_id))
+
+
+def deck_path(presentation_id: str) -> str:
+    return os.path.join(settings.STORAGE_PATH, f"{validate_id(presentation_id)}.pptx")
+
+
+def is_deck_file(name: str) -> bool:
+    """Whether a name under STORAGE_PATH may be downloaded: decks only, no temp or leftover files"""
+    return name.endswith(".pptx") and not name.startswith(".") and os.path.basename(name) == name
+
+
+def spec_path(presentation_id: str) -> str:
+    return os.path.join(settings.SPEC_PATH, f"{validate_id(presentation_id)}.json")
+
+
+def _legacy_spec_path(presentation_id: str) -> str:
+    # Specs used to be written next to the decks; they are moved on the next save
+    return os.path.join(settings.STORAGE_PATH, f"{validate_id(presentation_id)}.json")
+
+
+def write_atomic(path: str, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def save_spec(presentation_id: str, request: PresentationRequest, owner: Optional[str] = None):
+    """Store the slide spec; ``owner`` (see ``app.auth.owner_id``) is the only caller allowed to edit the deck"""
+    data = request.model_dump()
+    if owner:
+        data["owner"] = owner
+    os.makedirs(settings.SPEC_PATH, exist_ok=True)
+    write_atomic(spec_path(presentation_id), json.dumps(data).encode("utf-8"))
+    try:
+        os.unlink(_legacy_spec_path(presentation_id))
+    except FileNotFoundError:
+        pass
+
+
+def _read_spec(presentation_id: str) -> Optional[dict]:
+    for path in (spec_path(presentation_id), _legacy_spec_path(presentation_id)):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return None
+
+
+def load_spec(presentation_id: str, owner: Optional[str] = None) -> Optional[PresentationRequest]:
+    """
+    The stored spec, or None when there is none. With ``owner``, decks of
+    other owners (and anonymous ones) are reported as missing too.
+    """
+    data = _read_spec(presentation_id)
+    if data is None:
+        return None
+    if owner is not None and data.get("owner") != owner:
+        return None
+    data.pop("owner", None)
+    try:
+        return PresentationRequest(**data)
+    except ValueError:
+        return None
+
+
+def load_owner(presentation_id: str) -> Optional[str]:
+    data = _read_spec(presentation_id)
+    return data.get("owner") if data else None
+
+
+@contextmanager
+def deck_lock(presentation_id: str):
+    """
+    Exclusive lock on one deck, shared across worker processes through the
+    spec volume. Decks hash onto LOCK_STRIPES lock files, so the number of
+    lock files stays fixed however many decks there are.
+    """
+    stripe = uuid.UUID(presentation_id).int % LOCK_STRIPES
+    lock_dir = os.path.join(settings.SPEC_PATH, ".locks")
+    os.makedirs(lock_dir, exist_ok=True)
+    with open(os.path.join(lock_dir, f"{stripe}.lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,85 @@
+"""
+Per-owner presentation history in Redis.
+
+Each completed deck is a member of ``presentations:owner:<owner>``, a sorted
+set scored by creation time in microseconds, and its compact metadata lives
+in the hash ``presentation:<presentation_id>``. A page is a ZREVRANK of the
+cursor member, one ZREVRANGE after it and one pipelined HGETALL per item,
+so listing costs O(log N + page size) however long the history gets.
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+OWNER_KEY = "presentations:owner:{owner}"
+META_KEY = "presentation:{presentation_id}"
+
+_client = None
+
+
+def enabled() -> bool:
+    return settings.REDIS_URL.startswith(("redis://", "rediss://"))
+
+
+def get_client():
+    """One connection pool per process, created on first use (after the worker fork)"""
+    global _client
+    if _client is None:
+        import redis
+
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def record(owner: str, presentation_id: str, metadata: Dict):
+    """Add a completed deck to its owner's history"""
+    created_at = time.time()
+    meta = dict(metadata, presentation_id=presentation_id, created_at=created_at)
+    with get_client().pipeline() as pipe:
+        pipe.hset(META_KEY.format(presentation_id=presentation_id), mapping=meta)
+        pipe.zadd(OWNER_KEY.format(owner=owner), {presentation_id: int(created_at * 1_000_000)})
+        pipe.execute()
+
+
+def update(presentation_id: str, metadata: Dict):
+    """Refresh metadata of a deck that is already in some history (e.g. after an edit)"""
+    key = META_KEY.format(presentation_id=presentation_id)
+    client = get_client()
+    if client.exists(key):
+        client.hset(key, mapping=metadata)
+
+
+def list_page(owner: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Newest first. ``cursor`` is ``<score>:<presentation_id>`` of the last
+    item of the previous page; the next cursor is None on the last page.
+
+    The page resumes right after that member (ZREVRANK), so items sharing
+    its microsecond score are neither skipped nor repeated. If the member
+    is gone, it resumes below the score.
+    """
+    client = get_client()
+    key = OWNER_KEY.format(owner=owner)
+    if not cursor:
+        entries = client.zrevrange(key, 0, limit, withscores=True)
+    else:
+        score, _, member = cursor.partition(":")
+        rank = client.zrevrank(key, member) if member else None
+        if rank is not None:
+            entries = client.zrevrange(key, rank + 1, rank + 1 + limit, withscores=True)
+        else:
+            entries = client.zrevrangebyscore(key, f"({int(score)}", "-inf", start=0, num=limit + 1, withscores=True)
+    page, more = entries[:limit], len(entries) > limit
+
+    with client.pipeline() as pipe:
+        for presentation_id, _ in page:
+            pipe.hgetall(META_KEY.format(presentation_id=presentation_id))
+        metas = pipe.execute()
+
+    items = [meta for meta in metas if meta]
+    next_cursor = f"{int(page[-1][1])}:{page[-1][0]}" if more and page else None
+    return items, next_cursor
@@ -0,0 +1,382 @@
+"""
+Image loading for IMAGE slides.
+
+``ImageFetcher.fetch_all`` resolves every image of a deck in one concurrent
+wave over a pooled HTTP client, before rendering starts. Sources can be
+http(s) URLs, ``data:`` URLs or local paths under ``IMAGE_LOCAL_ROOT``.
+Images larger than the slide needs are downscaled and recompressed, and the
+result is kept in ``ImageCache``, a content-addressed, size-bounded disk
+cache shared by all workers that mount ``IMAGE_CACHE_PATH``. Cached http(s)
+images older than ``IMAGE_CACHE_TTL`` are revalidated with a conditional
+GET (ETag / Last-Modified) before reuse. Hosts that resolve to loopback,
+private or link-local addresses are refused, on every redirect hop.
+"""
+import asyncio
+import base64
+import hashlib
+import io
+import ipaddress
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from urllib.parse import unquote, urlparse
+
+from app.config import settings
+from app.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Formats python-pptx can embed as-is
+EMBEDDABLE_FORMATS = {"PNG": "png", "JPEG": "jpg", "GIF": "gif"}
+
+# Redirects are followed by hand so every hop goes through the host check
+MAX_REDIRECTS = 5
+
+
+def _blocked_address(ip) -> bool:
+    """Loopback, private, link-local (cloud metadata), reserved and multicast addresses"""
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return not ip.is_global or ip.is_multicast
+
+
+async def check_host(url: str):
+    """
+    Refuse URLs whose host resolves to a non-public address, so request
+    image URLs cannot reach internal services. ``IMAGE_ALLOW_PRIVATE_HOSTS``
+    turns the check off (local development, tests).
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError(f"unsupported image URL {url[:100]}")
+    if settings.IMAGE_ALLOW_PRIVATE_HOSTS:
+        return
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    infos = await asyncio.get_running_loop().getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM)
+    for *_, sockaddr in infos:
+        ip = ipaddress.ip_address(sockaddr[0].split("%")[0])
+        if _blocked_address(ip):
+            raise ValueError(f"{parsed.hostname} resolves to non-public address {ip}")
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    width: int
+    height: int
+
+
+def prepare_image(data: bytes) -> Optional[PreparedImage]:
+    """
+    Validate an image and shrink it to slide resolution.
+
+    Oversized images (larger than ``IMAGE_MAX_WIDTH`` x ``IMAGE_MAX_HEIGHT`` or
+    ``IMAGE_RECOMPRESS_BYTES``) and formats PowerPoint handles poorly are
+    re-encoded: JPEG for opaque images, optimized PNG when there is alpha.
+    """
+    from PIL import Image
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception as e:
+        logger.warning(f"Unreadable image ({len(data)} bytes): {e}")
+        return None
+
+    max_size = (settings.IMAGE_MAX_WIDTH, settings.IMAGE_MAX_HEIGHT)
+    oversized = image.width > max_size[0] or image.height > max_size[1]
+    if not oversized and len(data) <= settings.IMAGE_RECOMPRESS_BYTES and image.format in EMBEDDABLE_FORMATS:
+        return PreparedImage(data, image.width, image.height)
+
+    if oversized:
+        image.thumbnail(max_size, Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    if has_alpha:
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.convert("RGB").save(buffer, format="JPEG", quality=settings.IMAGE_JPEG_QUALITY, optimize=True)
+    return PreparedImage(buffer.getvalue(), image.width, image.height)
+
+
+@dataclass
+class CachedImage:
+    """A cache entry with the HTTP validators it was stored with"""
+    image: PreparedImage
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        return not ttl or time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ImageCache:
+    """
+    Content-addressed cache of prepared images.
+
+    ``blobs/<sha256>`` holds image bytes; ``sources/<sha256(source)>`` is a
+    small JSON index mapping a source to its blob (plus ETag/Last-Modified
+    for http(s) sources), so different URLs with the same content share one
+    blob. File mtimes track recency for both; ``evict`` drops the least
+    recently used files once the cache grows past ``max_bytes`` and then
+    removes index entries left pointing at evicted blobs. Writes go through
+    a temp file and ``os.replace``, so several workers can share the
+    directory.
+    """
+
+    def __init__(self, root: str = None, max_bytes: int = None):
+        self.root = root or settings.IMAGE_CACHE_PATH
+        self.max_bytes = max_bytes if max_bytes is not None else settings.IMAGE_CACHE_MAX_BYTES
+        self.blob_dir = os.path.join(self.root, "blobs")
+        self.source_dir = os.path.join(self.root, "sources")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.source_dir, exist_ok=True)
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _write_atomic(self, path: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _index_path(self, source_key: str) -> str:
+        return os.path.join(self.source_dir, self._digest(source_key.encode()))
+
+    def get(self, source_key: str) -> Optional[CachedImage]:
+        index = self._index_path(source_key)
+        try:
+            with open(index) as f:
+                entry = json.load(f)
+            path = os.path.join(self.blob_dir, entry["blob"])
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            os.utime(index)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return CachedImage(
+            PreparedImage(data, entry["width"], entry["height"]),
+            entry.get("stored_at", 0.0), entry.get("etag"), entry.get("last_modified"),
+        )
+
+    def put(self, source_key: str, image: PreparedImage, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        blob = self._digest(image.data)
+        path = os.path.join(self.blob_dir, blob)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            self._write_atomic(path, image.data)
+        entry = {
+            "blob": blob, "width": image.width, "height": image.height, "stored_at": time.time(),
+            "etag": etag, "last_modified": last_modified,
+        }
+        self._write_atomic(self._index_path(source_key), json.dumps(entry).encode())
+
+    def revalidated(self, source_key: str, cached: CachedImage):
+        """The origin confirmed ``cached`` is current (304): restart its freshness period"""
+        self.put(source_key, cached.image, cached.etag, cached.last_modified)
+
+    @staticmethod
+    def _scan(directory: str):
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, entry.path
+
+    def evict(self):
+        """
+        Drop least recently used blobs and index entries until the cache is
+        back under 90% of ``max_bytes``, then remove index entries whose blob
+        is gone.
+        """
+        entries = list(self._scan(self.blob_dir)) + list(self._scan(self.source_dir))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._prune_sources()
+
+    def _prune_sources(self):
+        blobs = set(os.listdir(self.blob_dir))
+        for _, _, path in self._scan(self.source_dir):
+            try:
+                with open(path) as f:
+                    blob = json.load(f).get("blob")
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, AttributeError):
+                blob = None
+            if blob not in blobs:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+
+class ImageFetcher:
+    """Resolve image sources concurrently, through the shared cache"""
+
+    def __init__(self, cache: ImageCache = None):
+        self.cache = cache or ImageCache()
+
+    def _source_key(self, source: str) -> str:
+        path = self._local_path(source)
+        if path is not None:
+            # Local files can change in place; key on their identity and mtime
+            try:
+                stat = os.stat(path)
+                return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+            except OSError:
+                return path
+        return source
+
+    def _local_path(self, source: str) -> Optional[str]:
+        if source.startswith(("http://", "https://", "data:")):
+            return None
+        path = unquote(urlparse(source).path) if source.startswith("file://") else source
+        return os.path.realpath(path)
+
+    def _read_local(self, path: str) -> bytes:
+        root = settings.IMAGE_LOCAL_ROOT
+        if not root:
+            raise ValueError("local image paths are disabled (IMAGE_LOCAL_ROOT is not set)")
+        root = os.path.realpath(root)
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"{path} is outside IMAGE_LOCAL_ROOT")
+        if os.path.getsize(path) > settings.IMAGE_MAX_BYTES:
+            raise ValueError(f"{path} exceeds IMAGE_MAX_BYTES")
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _decode_data_url(source: str) -> bytes:
+        header, _, payload = source.partition(",")
+        if header.endswith(";base64"):
+            return base64.b64decode(payload)
+        return unquote(payload).encode("latin-1")
+
+    async def _download(self, client, url: str, cached: Optional[CachedImage] = None):
+        """
+        ``(data, etag, last_modified)``; ``data`` is None when the origin
+        answers 304 to the conditional request built from ``cached``.
+        """
+        headers = cached.conditional_headers() if cached is not None else {}
+        for _ in range(MAX_REDIRECTS + 1):
+            await check_host(url)
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.is_redirect:
+                    url = str(response.url.join(response.headers["location"]))
+                    continue
+                if response.status_code == 304 and cached is not None:
+                    return None, cached.etag, cached.last_modified
+                response.raise_for_status()
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > settings.IMAGE_MAX_BYTES:
+                        raise ValueError(f"{url} exceeds IMAGE_MAX_BYTES")
+                    chunks.append(chunk)
+                return b"".join(chunks), response.headers.get("etag"), response.headers.get("last-modified")
+        raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+    async def _fetch_one(self, client, semaphore: asyncio.Semaphore, source: str) -> Optional[PreparedImage]:
+        key = self._source_key(source)
+        remote = source.startswith(("http://", "https://"))
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None and (not remote or cached.is_fresh(settings.IMAGE_CACHE_TTL)):
+            CACHE_REQUESTS.labels("image", "hit").inc()
+            return cached.image
+
+        etag = last_modified = None
+        try:
+            if source.startswith("data:"):
+                data = self._decode_data_url(source)
+            elif remote:
+                async with semaphore:
+                    data, etag, last_modified = await self._download(client, source, cached)
+            else:
+                data = await asyncio.to_thread(self._read_local, self._local_path(source))
+        except Exception as e:
+            if cached is not None:
+                logger.warning(f"Could not revalidate image {source[:100]}, using cached copy: {e}")
+                CACHE_REQUESTS.labels("image", "hit").inc()
+                return cached.image
+            logger.warning(f"Could not load image {source[:100]}: {e}")
+            CACHE_REQUESTS.labels("image", "miss").inc()
+            return None
+
+        if data is None:
+            await asyncio.to_thread(self.cache.revalidated, key, cached)
+            CACHE_REQUESTS.labels("image", "hit").inc()
+            return cached.image
+
+        CACHE_REQUESTS.labels("image", "miss").inc()
+        image = await asyncio.to_thread(prepare_image, data)
+        if image is not None:
+            await asyncio.to_thread(self.cache.put, key, image, etag, last_modified)
+        return image
+
+    async def _fetch_all(self, sources) -> Dict[str, Optional[PreparedImage]]:
+        import httpx
+
+        semaphore = asyncio.Semaphore(settings.IMAGE_FETCH_CONCURRENCY)
+        limits = httpx.Limits(max_connections=settings.IMAGE_FETCH_CONCURRENCY)
+        async with httpx.AsyncClient(
+            limits=limits, timeout=settings.IMAGE_FETCH_TIMEOUT, follow_redirects=False
+        ) as client:
+            results = await asyncio.gather(*(self._fetch_one(client, semaphore, s) for s in sources))
+        return dict(zip(sources, results))
+
+    def fetch_all(self, sources: Iterable[str]) -> Dict[str, Optional[PreparedImage]]:
+        """
+        Load all distinct sources in one concurrent wave.
+
+        Returns ``source -> PreparedImage``; sources that could not be loaded map to None.
+        """
+        unique = list(dict.fromkeys(s for s in sources if s))
+        if not unique:
+            return {}
+        images = asyncio.run(self._fetch_all(unique))
+        try:
+            self.cache.evict()
+        except OSError as e:
+            logger.warning(f"Image cache eviction failed: {e}")
+        return images
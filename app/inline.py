@@ -0,0 +1,124 @@
+"""
+Inline fast path: small decks rendered inside the API process.
+
+A deck of a few slides renders in milliseconds, much less than the broker
+round trip plus status polling. ``InlineRenderer`` runs those renders in a
+small thread pool, off the event loop, with one slot per thread:
+
+- when every slot is busy, ``render`` returns None and the caller enqueues
+  the Celery task as usual;
+- a render that outlives ``timeout`` keeps its slot and finishes in the
+  background.
+
+Either way the result is stored in the Celery result backend under the task
+id returned to the client, so the normal status polling works for inline
+renders too, whether the response said ``completed`` or ``pending``.
+
+The renderer (python-pptx) is imported on the first inline render, so
+importing this module keeps the API start-up light.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from app.config import settings
+from app.metrics import INLINE_RENDERS
+from app.models import PresentationRequest
+
+logger = logging.getLogger(__name__)
+
+
+class InlineRenderer:
+    def __init__(self, celery_app, workers: int, timeout: float):
+        self.celery_app = celery_app
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def accepts(self, request: PresentationRequest, sync: Optional[bool]) -> bool:
+        """
+        ``sync`` True/False forces the choice; None means automatic, i.e.
+        inline for decks of at most ``INLINE_MAX_SLIDES`` slides (0 by
+        default, so only ``sync=true`` renders inline). Decks big enough for
+        large-deck mode always go to the workers.
+        """
+        slide_count = len(request.slides)
+        if self.workers <= 0 or sync is False:
+            return False
+        if settings.LARGE_DECK_THRESHOLD and slide_count >= settings.LARGE_DECK_THRESHOLD:
+            return False
+        if sync:
+            return True
+        return settings.INLINE_MAX_SLIDES > 0 and slide_count <= settings.INLINE_MAX_SLIDES
+
+    async def render(self, request: PresentationRequest,
+                     owner: Optional[str] = None) -> Optional[Tuple[str, Optional[dict]]]:
+        """
+        ``(task_id, result)`` with ``result`` None when the render did not
+        finish within the timeout; None when no slot is free.
+        """
+        if not self._slots.acquire(blocking=False):
+            INLINE_RENDERS.labels("saturated").inc()
+            return None
+
+        task_id = str(uuid.uuid4())
+        # Copy the context so render spans nest under the request span
+        context = contextvars.copy_context()
+        try:
+            future = self._get_executor().submit(context.run, self._run, request, owner, task_id)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        try:
+            # shield: a timeout must not cancel the render itself
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            INLINE_RENDERS.labels("timeout").inc()
+            logger.info(f"Inline render {task_id} exceeded {self.timeout}s, result goes to the backend")
+            return task_id, None
+        except Exception:
+            INLINE_RENDERS.labels("failed").inc()
+            raise
+
+        INLINE_RENDERS.labels("completed").inc()
+        return task_id, result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, self.workers),
+                                                    thread_name_prefix="inline-render")
+            return self._executor
+
+    def _run(self, request: PresentationRequest, owner: Optional[str], task_id: str) -> dict:
+        try:
+            from app.rendering import render_presentation
+
+            try:
+                result = render_presentation(request, owner, task_id)
+            except Exception as e:
+                logger.error(f"Inline render {task_id} failed: {e}")
+                self._store_result(task_id, e, "FAILURE")
+                raise
+            # Stored before the response goes out, so polling right after it never sees PENDING
+            self._store_result(task_id, result, "SUCCESS")
+            return result
+        finally:
+            self._slots.release()
+
+    def _store_result(self, task_id: str, result, state: str):
+        try:
+            self.celery_app.backend.store_result(task_id, result, state)
+        except Exception as e:
+            logger.error(f"Could not store inline result {task_id}: {e}")
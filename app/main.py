@@ -1,19 +1,32 @@
 import os
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
-from fastapi.responses import FileResponse
+import time
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Depends, Query
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from celery.result import AsyncResult
+from opentelemetry.trace import SpanKind
 from typing import Optional
 
-from app.models import PresentationRequest, PDFPresentationRequest, PresentationResponse, PresentationStatus
+from app.models import (
+    PresentationRequest, PDFPresentationRequest, PresentationResponse, PresentationStatus, SlideContent,
+    PresentationSummary, PresentationHistoryPage
+)
+from app import history
+from app.auth import get_optional_owner, get_owner
 from app.config import settings
-from app.pdf_processor import PDFProcessor
-from celery_app.tasks import generate_presentation_task
+from app.deck_store import is_deck_file, load_spec
+from app.inline import InlineRenderer
+from app.metrics import REQUEST_LATENCY, REQUESTS_IN_FLIGHT, STAGE_DURATION, render_latest, route_template
+from app.readiness import ReadinessProbe
+from app.tracing import configure_tracing, extract_context, tracer
+from celery_app import (
+    app as celery_app, GENERATE_PRESENTATION_TASK, GENERATE_PRESENTATION_FROM_PDF_TASK, EDIT_PRESENTATION_TASK
+)
 
 # Routers import qilish
 from app.routes.pricing import router as pricing_router
 from app.routes.auth import router as auth_router
+from app.routes.admin import router as admin_router
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -35,10 +48,68 @@ app.add_middleware(
 # Routers ni qo'shish
 app.include_router(auth_router)
 app.include_router(pricing_router)
+app.include_router(admin_router)
+
+class DeckFiles(StaticFiles):
+    """Serves the generated decks only, never temp files or anything else left in STORAGE_PATH"""
+
+    async def get_response(self, path: str, scope):
+        if not is_deck_file(path):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
 
 # Mount storage directory for file downloads
 os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-app.mount("/download", StaticFiles(directory=settings.STORAGE_PATH), name="download")
+app.mount("/download", DeckFiles(directory=settings.STORAGE_PATH), name="download")
+
+
+readiness_probe = ReadinessProbe(celery_app)
+inline_renderer = InlineRenderer(celery_app, settings.INLINE_WORKERS, settings.INLINE_TIMEOUT)
+
+
+@app.on_event("startup")
+async def setup_tracing():
+    configure_tracing("presentation-api")
+
+
+@app.on_event("startup")
+async def start_readiness_probe():
+    readiness_probe.start()
+
+
+@app.on_event("shutdown")
+async def stop_readiness_probe():
+    await readiness_probe.stop()
+
+
+@app.on_event("shutdown")
+async def stop_inline_renderer():
+    inline_renderer.shutdown()
+
+
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    """Open a server span and record latency per route template and in-flight requests"""
+    # Resolve the template before routing rewrites the scope for mounted apps
+    route = route_template(app, request.scope)
+    REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status_code = 500
+    with tracer.start_as_current_span(
+        f"{request.method} {route}",
+        context=extract_context(dict(request.headers)),
+        kind=SpanKind.SERVER,
+        attributes={"http.method": request.method, "http.route": route},
+    ) as span:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            span.set_attribute("http.status_code", status_code)
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_LATENCY.labels(request.method, route, str(status_code)).observe(time.perf_counter() - start)
 
 
 def get_base_url(request: Request) -> str:
@@ -72,12 +143,109 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness for load balancers: 503 when the broker, backend or storage is unavailable"""
+    snapshot = await readiness_probe.get()
+    return JSONResponse(
+        status_code=200 if snapshot["ready"] else 503,
+        content={"ready": snapshot["ready"], "status": snapshot["status"], "scaling": snapshot["scaling"]}
+    )
+
+
+@app.get("/health/deep")
+async def deep_health_check():
+    """Detailed dependency checks, worker capacity, queue lag and scaling signal"""
+    snapshot = await readiness_probe.get()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics endpoint (sync: collection queries Redis and walks STORAGE_PATH, so it runs in the threadpool)"""
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
+
+
+@app.get("/api/presentations", response_model=PresentationHistoryPage)
+def list_presentations(
+        request: Request,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, pattern="^[0-9]+(:[0-9a-f-]{36})?$"),
+        owner: str = Depends(get_owner)
+):
+    """List the caller's generated presentations, newest first (cursor pagination)"""
+    if not history.enabled():
+        return PresentationHistoryPage(items=[])
+
+    try:
+        items, next_cursor = history.list_page(owner, limit, cursor)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to list presentations: {str(e)}"
+        )
+
+    base_url = get_base_url(request)
+    return PresentationHistoryPage(
+        items=[
+            PresentationSummary(file_url=f"{base_url}/download/{item['file_key']}", **item)
+            for item in items
+        ],
+        next_cursor=next_cursor
+    )
+
+
 @app.post("/api/presentations", response_model=PresentationResponse)
-async def create_presentation(request: PresentationRequest):
-    """Submit a new presentation generation task"""
+async def create_presentation(
+        request: PresentationRequest,
+        http_request: Request,
+        sync: Optional[bool] = Query(None, description="true = render inline, false = always queue"),
+        download: bool = Query(False, description="Return the .pptx itself when rendered inline"),
+        owner: Optional[str] = Depends(get_optional_owner)
+):
+    """
+    Submit a new presentation generation task.
+
+    With `sync=true` (or automatically for decks of up to `INLINE_MAX_SLIDES`
+    slides, off by default) the deck is rendered inline and returned
+    completed; when the inline pool is busy the request is queued as usual.
+    """
+    if inline_renderer.accepts(request, sync):
+        try:
+            rendered = await inline_renderer.render(request, owner)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to create presentation: {str(e)}"
+            )
+
+        if rendered is not None:
+            task_id, result = rendered
+            if result is None:
+                # Still rendering; the result will be under task_id
+                return PresentationResponse(task_id=task_id, status="pending")
+
+            file_name = os.path.basename(result["file_url"])
+            if download:
+                return FileResponse(
+                    path=os.path.join(settings.STORAGE_PATH, file_name),
+                    filename=file_name,
+                    media_type='application/vnd.openxmlformats-officedocument.presentationml.presentation',
+                    headers={"X-Task-Id": task_id}
+                )
+            return PresentationResponse(
+                task_id=task_id,
+                status="completed",
+                file_url=f"{get_base_url(http_request)}{result['file_url']}",
+                presentation_id=result["presentation_id"]
+            )
+
     try:
         # Submit task to Celery
-        task = generate_presentation_task.delay(request.model_dump())
+        task = celery_app.send_task(
+            GENERATE_PRESENTATION_TASK, args=[request.model_dump()], kwargs={"owner": owner}
+        )
 
         return PresentationResponse(
             task_id=task.id,
@@ -96,19 +264,23 @@ async def create_presentation_from_pdf(
         title: Optional[str] = Form(None),
         author: str = Form("Generated Presentation"),
         theme: str = Form("default"),
-        num_slides: int = Form(5)
+        num_slides: int = Form(5),
+        owner: Optional[str] = Depends(get_optional_owner)
 ):
     """Submit a presentation generation task from PDF file"""
     if not pdf_file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="File must be a PDF")
 
     try:
+        from app.pdf_processor import PDFProcessor
+
         # Read PDF file content
         pdf_content = await pdf_file.read()
 
         # Extract text from PDF
         processor = PDFProcessor()
-        pdf_text = processor.extract_text_from_pdf(pdf_content)
+        with STAGE_DURATION.labels("extract").time():
+            pdf_text = processor.extract_text_from_pdf(pdf_content)
 
         # Create request object
         request = PDFPresentationRequest(
@@ -119,7 +291,9 @@ async def create_presentation_from_pdf(
         )
 
         # Submit task to Celery
-        task = generate_presentation_task.delay(pdf_text, request.model_dump())
+        task = celery_app.send_task(
+            GENERATE_PRESENTATION_FROM_PDF_TASK, args=[pdf_text, request.model_dump()], kwargs={"owner": owner}
+        )
 
         return PresentationResponse(task_id=task.id, status="pending")
 
@@ -134,7 +308,7 @@ async def create_presentation_from_pdf(
 async def get_presentation_status(task_id: str, request: Request):
     """Get the status of a presentation generation task"""
     try:
-        task_result = AsyncResult(task_id)
+        task_result = celery_app.AsyncResult(task_id)
         base_url = get_base_url(request)
 
         if task_result.state == 'PENDING':
@@ -162,6 +336,7 @@ async def get_presentation_status(task_id: str, request: Request):
                 task_id=task_id,
                 status="completed",
                 file_url=file_url,
+                presentation_id=result.get('presentation_id'),
                 message=result.get('message', 'Presentation generated successfully')
             )
         else:
@@ -177,12 +352,54 @@ async def get_presentation_status(task_id: str, request: Request):
         )
 
 
+def submit_slide_edit(presentation_id: str, owner: str, operation: str, index: int,
+                      slide: Optional[SlideContent] = None):
+    """Validate an edit against the stored slide spec and enqueue it; only the deck's owner may edit"""
+    spec = load_spec(presentation_id, owner=owner)
+    if spec is None:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+
+    upper = len(spec.slides) if operation == "insert" else len(spec.slides) - 1
+    if not 0 <= index <= upper:
+        raise HTTPException(status_code=400, detail=f"Slide index must be between 0 and {upper}")
+
+    try:
+        task = celery_app.send_task(
+            EDIT_PRESENTATION_TASK,
+            args=[presentation_id, operation, index, slide.model_dump() if slide else None]
+        )
+        return PresentationResponse(task_id=task.id, status="pending")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to edit presentation: {str(e)}"
+        )
+
+
+@app.patch("/api/presentations/{presentation_id}/slides/{index}", response_model=PresentationResponse)
+async def replace_slide(presentation_id: str, index: int, slide: SlideContent, owner: str = Depends(get_owner)):
+    """Replace one slide; only that slide is re-rendered"""
+    return submit_slide_edit(presentation_id, owner, "replace", index, slide)
+
+
+@app.post("/api/presentations/{presentation_id}/slides/{index}", response_model=PresentationResponse)
+async def insert_slide(presentation_id: str, index: int, slide: SlideContent, owner: str = Depends(get_owner)):
+    """Insert a slide before position `index` (`index` = slide count appends)"""
+    return submit_slide_edit(presentation_id, owner, "insert", index, slide)
+
+
+@app.delete("/api/presentations/{presentation_id}/slides/{index}", response_model=PresentationResponse)
+async def delete_slide(presentation_id: str, index: int, owner: str = Depends(get_owner)):
+    """Delete one slide"""
+    return submit_slide_edit(presentation_id, owner, "delete", index)
+
+
 @app.get("/api/download/{file_id}")
 async def download_presentation(file_id: str):
     """Download a generated presentation"""
     file_path = os.path.join(settings.STORAGE_PATH, file_id)
 
-    if not os.path.exists(file_path):
+    if not is_deck_file(file_id) or not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
 
     return FileResponse(
@@ -0,0 +1,193 @@
+"""
+Prometheus metrics shared by the API and the Celery workers.
+
+The API serves them on ``/metrics``; workers expose them through
+``start_worker_exporter``. When ``PROMETHEUS_MULTIPROC_DIR`` is set (uvicorn
+with several workers, Celery prefork pool) samples from all processes are
+aggregated through prometheus_client's multiprocess mode.
+"""
+import logging
+import os
+import time
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+from starlette.routing import Match
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Default Celery queue; kombu keeps it as a Redis list of the same name
+CELERY_QUEUES = ("celery",)
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+STAGE_DURATION = Histogram(
+    "presentation_stage_duration_seconds",
+    "Time spent in each presentation pipeline stage (extract, condense, llm, images, render, save)",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+OPENAI_LATENCY = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI API call latency",
+    ["model"],
+    buckets=STAGE_BUCKETS,
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens",
+    "OpenAI tokens consumed",
+    ["model", "kind"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "Cache lookups by cache name and result (hit/miss); ratio = hit / (hit + miss)",
+    ["cache", "result"],
+)
+INLINE_RENDERS = Counter(
+    "inline_renders",
+    "Inline fast-path attempts by outcome (completed, timeout, saturated, failed)",
+    ["outcome"],
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+class SystemCollector:
+    """
+    Scrape-time gauges read from outside the process: Celery queue depth in
+    the broker and bytes used under ``STORAGE_PATH``. The storage walk is
+    cached for ``storage_ttl`` seconds so frequent scrapes stay cheap.
+    """
+
+    def __init__(self, storage_ttl: float = 30.0):
+        self.storage_ttl = storage_ttl
+        self._storage: Optional[Tuple[float, int]] = None
+        self._redis = None
+
+    def _broker(self):
+        if self._redis is None and settings.REDIS_URL.startswith(("redis://", "rediss://")):
+            import redis
+
+            self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        return self._redis
+
+    def queue_depths(self):
+        client = self._broker()
+        if client is None:
+            return {}
+        try:
+            with client.pipeline() as pipe:
+                for queue in CELERY_QUEUES:
+                    pipe.llen(queue)
+                return dict(zip(CELERY_QUEUES, pipe.execute()))
+        except Exception as e:
+            logger.debug(f"Queue depth unavailable: {e}")
+            return {}
+
+    def storage_bytes(self) -> int:
+        now = time.monotonic()
+        if self._storage and now - self._storage[0] < self.storage_ttl:
+            return self._storage[1]
+
+        total = 0
+        for root, _, files in os.walk(settings.STORAGE_PATH):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        self._storage = (now, total)
+        return total
+
+    def describe(self):
+        # Lets the registry learn metric names without touching Redis or the disk
+        yield GaugeMetricFamily("celery_queue_depth", "Messages waiting in the Celery queue", labels=["queue"])
+        yield GaugeMetricFamily("storage_used_bytes", "Bytes used by generated files under STORAGE_PATH")
+
+    def collect(self):
+        depth = GaugeMetricFamily("celery_queue_depth", "Messages waiting in the Celery queue", labels=["queue"])
+        for queue, length in self.queue_depths().items():
+            depth.add_metric([queue], length)
+        yield depth
+
+        yield GaugeMetricFamily(
+            "storage_used_bytes", "Bytes used by generated files under STORAGE_PATH", value=self.storage_bytes()
+        )
+
+
+system_collector = SystemCollector()
+
+
+def _api_registry() -> CollectorRegistry:
+    if multiprocess_enabled():
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(system_collector)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition payload and content type for the ``/metrics`` endpoint"""
+    return generate_latest(_api_registry()), CONTENT_TYPE_LATEST
+
+
+def route_template(app, scope) -> str:
+    """Route path template (``/api/presentations/{task_id}``) to keep label cardinality bounded"""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+def start_worker_exporter(port: int):
+    """Serve worker metrics on ``port`` (called once, from the main worker process)"""
+    if multiprocess_enabled():
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(system_collector)
+        start_http_server(port, registry=registry)
+    else:
+        start_http_server(port)
+    logger.info(f"Worker metrics exporter listening on :{port}")
+
+
+def mark_process_dead(pid: int):
+    """Drop live gauges of an exited child process in multiprocess mode"""
+    if multiprocess_enabled():
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
+if not multiprocess_enabled():
+    REGISTRY.register(system_collector)
@@ -34,9 +34,25 @@ class PDFPresentationRequest(BaseModel):
 class PresentationResponse(BaseModel):
     task_id: str
     status: str = "pending"
+    file_url: Optional[str] = None
+    presentation_id: Optional[str] = None
 
 class PresentationStatus(BaseModel):
     task_id: str
     status: str
     file_url: Optional[str] = None
-    message: Optional[str] = None
\ No newline at end of file
+    presentation_id: Optional[str] = None
+    message: Optional[str] = None
+
+class PresentationSummary(BaseModel):
+    presentation_id: str
+    title: str
+    slide_count: int
+    size_bytes: int
+    render_seconds: float
+    file_url: str
+    created_at: float
+
+class PresentationHistoryPage(BaseModel):
+    items: List[PresentationSummary]
+    next_cursor: Optional[str] = None
@@ -1,35 +1,66 @@
 import os
 import tempfile
-from PyPDF2 import PdfReader
-from openai import OpenAI
+import time
+from opentelemetry import trace
 from typing import List, Dict, Any
 from app.config import settings
+from app.metrics import OPENAI_LATENCY, OPENAI_TOKENS
+from app.tracing import tracer
 from app.models import SlideContent, SlideType
+from app.text_condenser import PAGE_SEPARATOR, condense, count_tokens
 
 class PDFProcessor:
+    MODEL = "gpt-4o"
+
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self._client = None
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use so text extraction does not load openai"""
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._client
 
+    @tracer.start_as_current_span("extract_text_from_pdf")
     def extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """Extract text content from PDF bytes"""
+        """Extract text content from PDF bytes, one form feed between pages"""
+        from PyPDF2 import PdfReader
+
         with tempfile.NamedTemporaryFile(delete=False) as temp:
             temp.write(pdf_content)
             temp_path = temp.name
 
         try:
             pdf = PdfReader(temp_path)
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-
-            return text
+            return PAGE_SEPARATOR.join(page.extract_text() for page in pdf.pages)
         finally:
             # Clean up the temp file
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
 
+    @tracer.start_as_current_span("condense_text")
+    def condense_text(self, text: str) -> str:
+        """Strip boilerplate and fit the text into LLM_INPUT_TOKEN_BUDGET tokens"""
+        result = condense(text, settings.LLM_INPUT_TOKEN_BUDGET, self.MODEL)
+        span = trace.get_current_span()
+        span.set_attribute("condense.pages", result.pages)
+        span.set_attribute("condense.input_tokens", result.input_tokens)
+        span.set_attribute("condense.output_tokens", result.output_tokens)
+        span.set_attribute("condense.boilerplate_lines", result.boilerplate_lines)
+        span.set_attribute("condense.passages_kept", result.passages_kept)
+        span.set_attribute("condense.passages_total", result.passages_total)
+        return result.text
+
+    @tracer.start_as_current_span("generate_presentation_content")
     def generate_presentation_content(self, text: str, title: str = None, num_slides: int = 5) -> Dict[str, Any]:
         """Generate presentation content using OpenAI"""
+        # Callers normally pass condense_text output; enforce the budget either way
+        if count_tokens(text, self.MODEL) > settings.LLM_INPUT_TOKEN_BUDGET:
+            text = self.condense_text(text)
+
         # Prepare the system message
         system_message = f"""
         You are an expert presentation creator. Your task is to create a well-structured presentation 
@@ -46,7 +77,7 @@ class PDFProcessor:
         user_message = f"""
         Create a presentation based on the following content:
 
-        {text[:10000]}  # Limit text to avoid token limits
+        {text}
 
         Please structure your response in JSON format with the following structure:
         {{
@@ -77,14 +108,23 @@ class PDFProcessor:
             user_message += f"\nUse '{title}' as the presentation title."
 
         # Call the OpenAI API
+        start = time.perf_counter()
         response = self.client.chat.completions.create(
-            model="gpt-4o",
+            model=self.MODEL,
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": user_message}
             ]
         )
+        OPENAI_LATENCY.labels(self.MODEL).observe(time.perf_counter() - start)
+        span = trace.get_current_span()
+        span.set_attribute("llm.model", self.MODEL)
+        if response.usage:
+            span.set_attribute("llm.prompt_tokens", response.usage.prompt_tokens)
+            span.set_attribute("llm.completion_tokens", response.usage.completion_tokens)
+            OPENAI_TOKENS.labels(self.MODEL, "prompt").inc(response.usage.prompt_tokens)
+            OPENAI_TOKENS.labels(self.MODEL, "completion").inc(response.usage.completion_tokens)
 
         # Extract the response content
         content = response.choices[0].message.content
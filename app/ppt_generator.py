@@ -1,21 +1,51 @@
 import os
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import uuid
+from io import BytesIO
+from typing import Dict, List, Optional
 from pptx import Presentation
 from pptx.util import Inches, Pt
+from opentelemetry import context
 from app.models import SlideType, SlideContent, PresentationRequest
 from app.config import settings
+from app.deck_store import save_spec
+from app.image_fetcher import ImageFetcher, PreparedImage
+from app.metrics import STAGE_DURATION
+from app.pptx_package import PackageEditor, PptxPackage
+from app.tracing import configure_tracing, extract_environ, inject_environ, tracer
 
 class PPTGenerator:
     def __init__(self):
         # Ensure storage directory exists
         os.makedirs(settings.STORAGE_PATH, exist_ok=True)
 
-    def generate_presentation(self, request: PresentationRequest) -> str:
-        """Generate a PowerPoint slide based on the request"""
-        prs = Presentation()
+    def _fetch_images(self, slides: List[SlideContent]) -> Dict[str, Optional[PreparedImage]]:
+        """Fetch every image up front in one concurrent wave"""
+        image_urls = [s.image_url for s in slides if s.type == SlideType.IMAGE and s.image_url]
+        if not image_urls:
+            return {}
+        with STAGE_DURATION.labels("images").time(), tracer.start_as_current_span(
+            "fetch_images", attributes={"images.count": len(image_urls)}
+        ):
+            return ImageFetcher().fetch_all(image_urls)
+
+    def _add_slides(self, prs: Presentation, slides: List[SlideContent], first_index: int = 0):
+        images = self._fetch_images(slides)
+        for index, slide_content in enumerate(slides, start=first_index):
+            with tracer.start_as_current_span(
+                "_add_slide",
+                attributes={"slide.index": index, "slide.type": slide_content.type.value},
+            ):
+                self._add_slide(prs, slide_content, images.get(slide_content.image_url))
 
-        # Add title slide
+    def _add_title_slide(self, prs: Presentation, request: PresentationRequest):
         title_slide_layout = prs.slide_layouts[0]
         slide = prs.slides.add_slide(title_slide_layout)
         title = slide.shapes.title
@@ -23,18 +53,129 @@ class PPTGenerator:
         title.text = request.title
         subtitle.text = f"By {request.author}"
 
-        # Add content slides
-        for slide_content in request.slides:
-            self._add_slide(prs, slide_content)
-
-        # Save the presentation
+    def generate_presentation(self, request: PresentationRequest, owner: Optional[str] = None) -> str:
+        """Generate a PowerPoint slide based on the request"""
         file_id = str(uuid.uuid4())
         file_path = os.path.join(settings.STORAGE_PATH, f"{file_id}.pptx")
-        prs.save(file_path)
+
+        if settings.LARGE_DECK_THRESHOLD and len(request.slides) >= settings.LARGE_DECK_THRESHOLD:
+            self._generate_large(request, file_path)
+        else:
+            with STAGE_DURATION.labels("render").time():
+                prs = Presentation()
+
+                # Add title slide
+                self._add_title_slide(prs, request)
+
+                # Add content slides
+                self._add_slides(prs, request.slides)
+
+            # Save the presentation
+            with STAGE_DURATION.labels("save").time(), tracer.start_as_current_span("prs.save"):
+                prs.save(file_path)
+
+        # Keep the slide spec so the deck can be edited slide by slide later
+        save_spec(file_id, request, owner)
 
         return file_path
 
-    def _add_slide(self, prs: Presentation, content: SlideContent):
+    def _generate_large(self, request: PresentationRequest, file_path: str):
+        """
+        Large-deck mode: render chunks of slides in separate processes, then merge them.
+
+        No process ever holds more than LARGE_DECK_CHUNK_SIZE slides in a
+        Presentation tree, and the merge streams slide parts from the chunk
+        files into the output package, so peak memory does not grow with the
+        slide count.
+        """
+        chunk_size = settings.LARGE_DECK_CHUNK_SIZE
+        with tempfile.TemporaryDirectory(prefix="pptx-chunks-") as workdir:
+            jobs = []
+            for start in range(0, len(request.slides), chunk_size):
+                spec = os.path.join(workdir, f"chunk-{start}.json")
+                with open(spec, "w", encoding="utf-8") as f:
+                    json.dump([s.model_dump() for s in request.slides[start:start + chunk_size]], f)
+                jobs.append((spec, start, os.path.join(workdir, f"chunk-{start}.pptx")))
+            with tracer.start_as_current_span(
+                "render_chunks", attributes={"slides.count": len(request.slides), "chunks.count": len(jobs)}
+            ):
+                chunk_paths = self._render_chunks(jobs)
+
+            base_path = os.path.join(workdir, "base.pptx")
+            prs = Presentation()
+            self._add_title_slide(prs, request)
+            prs.save(base_path)
+
+            with STAGE_DURATION.labels("save").time(), tracer.start_as_current_span("merge_chunks"):
+                sources = [PptxPackage(path) for path in chunk_paths]
+                try:
+                    with PackageEditor(base_path) as editor:
+                        for source in sources:
+                            for part in source.slide_parts():
+                                editor.insert_slide(len(editor), source, part)
+                        editor.save(file_path)
+                finally:
+                    for source in sources:
+                        source.close()
+
+    def _render_chunks(self, jobs) -> List[str]:
+        """
+        Split the chunks over LARGE_DECK_PROCESSES ``python -m app.ppt_generator`` processes.
+
+        Plain subprocesses rather than multiprocessing: Celery prefork pool
+        processes are daemonic and may not start multiprocessing children.
+        Each process renders its chunks one after another, so start-up cost
+        is paid per process and memory per chunk. Processes still running
+        when this returns or raises are killed; chunk processes also exit on
+        their own if the worker that started them dies (hard time limit).
+        """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+        # Chunk processes continue the current trace (their slide spans nest under render_chunks)
+        inject_environ(env)
+        processes = min(settings.LARGE_DECK_PROCESSES or os.cpu_count() or 1, len(jobs))
+        running: List[subprocess.Popen] = []
+        lock = threading.Lock()
+        stopped = False
+
+        def run(share):
+            args = [str(item) for job in share for item in job]
+            with lock:
+                if stopped:
+                    return
+                proc = subprocess.Popen(
+                    [sys.executable, "-m", "app.ppt_generator", *args], env=env,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                )
+                running.append(proc)
+            _, stderr = proc.communicate()
+            if proc.returncode:
+                raise RuntimeError(f"Rendering slide chunks failed:\n{stderr[-2000:]}")
+
+        pool = ThreadPoolExecutor(processes)
+        try:
+            list(pool.map(run, [jobs[i::processes] for i in range(processes)]))
+        finally:
+            # A failed share, a soft time limit or a revoke must not leave chunk processes behind
+            with lock:
+                stopped = True
+                for proc in running:
+                    if proc.poll() is None:
+                        proc.kill()
+            pool.shutdown(wait=True)
+        return [output for _, _, output in jobs]
+
+    def render_slides(self, slides: List[SlideContent], first_index: int = 0) -> BytesIO:
+        """Render only the given slides into an in-memory deck, for splicing into an existing one"""
+        with STAGE_DURATION.labels("render").time():
+            prs = Presentation()
+            self._add_slides(prs, slides, first_index)
+        buffer = BytesIO()
+        prs.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def _add_slide(self, prs: Presentation, content: SlideContent, image: Optional[PreparedImage] = None):
         """Add a slide based on its type and content"""
         if content.type == SlideType.TITLE:
             slide_layout = prs.slide_layouts[0]
@@ -92,5 +233,50 @@ class PPTGenerator:
             title = slide.shapes.title
             title.text = content.title
 
-            # Note: In a real application, you would handle image downloads
-            # and insertion here. For simplicity, we're omitting this.
\ No newline at end of file
+            # Images that failed to load leave a title-only slide
+            if image is not None:
+                self._add_picture(prs, slide, image)
+
+    def _add_picture(self, prs: Presentation, slide, image: PreparedImage):
+        """Fit the picture below the title, keeping its aspect ratio"""
+        margin = Inches(0.5)
+        top = Inches(1.5)
+        max_width = prs.slide_width - 2 * margin
+        max_height = prs.slide_height - top - margin
+
+        scale = min(max_width / image.width, max_height / image.height)
+        width = int(image.width * scale)
+        height = int(image.height * scale)
+        left = int((prs.slide_width - width) / 2)
+        slide.shapes.add_picture(BytesIO(image.data), left, top, width, height)
+
+
+def _exit_with_parent(interval: float = 1.0):
+    """Exit the chunk process once the worker that started it is gone (e.g. SIGKILLed)"""
+    parent = os.getppid()
+
+    def watch():
+        while os.getppid() == parent:
+            time.sleep(interval)
+        os._exit(1)
+
+    threading.Thread(target=watch, name="parent-watch", daemon=True).start()
+
+
+if __name__ == "__main__":
+    # Large-deck chunk process: python -m app.ppt_generator (<slides.json> <first_index> <output.pptx>)...
+    _exit_with_parent()
+    configure_tracing("presentation-worker")
+    context.attach(extract_environ())
+    generator = PPTGenerator()
+    args = sys.argv[1:]
+    for spec_file, first_index, output in zip(args[0::3], args[1::3], args[2::3]):
+        with open(spec_file, encoding="utf-8") as f:
+            slides = [SlideContent(**slide) for slide in json.load(f)]
+        with tracer.start_as_current_span(
+            "render_chunk", attributes={"slide.first_index": int(first_index), "slides.count": len(slides)}
+        ):
+            buffer = generator.render_slides(slides, int(first_index))
+            with open(output, "wb") as f:
+                f.write(buffer.getbuffer())
+        del slides, buffer
@@ -0,0 +1,321 @@
+"""
+Zip-level editing of generated .pptx packages.
+
+``PackageEditor`` changes the slide list of an existing deck without loading
+it into python-pptx: slide parts are imported from another package (e.g. a
+freshly rendered one-slide deck), ``presentation.xml``, its relationships and
+``[Content_Types].xml`` are patched, and every untouched zip entry is copied
+byte for byte, without decompressing or recompressing it. Imported media are
+named by content hash, so the same picture is stored once.
+"""
+import copy
+import hashlib
+import posixpath
+import struct
+import zipfile
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple, Union
+
+from lxml import etree
+
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+RT_SLIDE = NS_R + "/slide"
+RT_SLIDE_LAYOUT = NS_R + "/slideLayout"
+RT_IMAGE = NS_R + "/image"
+CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+
+PRESENTATION = "ppt/presentation.xml"
+CONTENT_TYPES = "[Content_Types].xml"
+
+# Local file header layout, see zipfile.structFileHeader
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+def rels_path(part: str) -> str:
+    """``ppt/slides/slide1.xml`` -> ``ppt/slides/_rels/slide1.xml.rels``"""
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def resolve_target(part: str, target: str) -> str:
+    """Resolve a relationship target relative to the part that owns it"""
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+
+def _serialize(tree) -> bytes:
+    return etree.tostring(tree, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+class PptxPackage:
+    """Read access to the parts of a .pptx package"""
+
+    def __init__(self, file: Union[str, BinaryIO]):
+        self._file = open(file, "rb") if isinstance(file, str) else file
+        self.zip = zipfile.ZipFile(self._file)
+
+    def close(self):
+        self.zip.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, name: str) -> bytes:
+        return self.zip.read(name)
+
+    def raw_entry(self, name: str) -> Tuple[zipfile.ZipInfo, bytes]:
+        """Entry metadata and its still-compressed bytes"""
+        info = self.zip.getinfo(name)
+        self._file.seek(info.header_offset)
+        header = _LOCAL_HEADER.unpack(self._file.read(_LOCAL_HEADER.size))
+        self._file.seek(header[10] + header[11], 1)  # file name + extra field
+        return info, self._file.read(info.compress_size)
+
+    def relationships(self, part: str):
+        name = rels_path(part)
+        if name not in self.zip.NameToInfo:
+            return etree.Element(f"{{{NS_RELS}}}Relationships", nsmap={None: NS_RELS})
+        return etree.fromstring(self.read(name))
+
+    def slide_parts(self) -> List[str]:
+        """Slide part names in presentation order"""
+        presentation = etree.fromstring(self.read(PRESENTATION))
+        rels = self.relationships(PRESENTATION)
+        targets = {rel.get("Id"): resolve_target(PRESENTATION, rel.get("Target")) for rel in rels}
+        return [targets[sld.get(f"{{{NS_R}}}id")] for sld in presentation.iter(f"{{{NS_P}}}sldId")]
+
+
+class PackageEditor(PptxPackage):
+    """
+    Insert, replace and delete slides of an existing package.
+
+    Changes are collected in memory and written by ``save`` to a new file;
+    the source package is never modified.
+    """
+
+    def __init__(self, file):
+        super().__init__(file)
+        self._presentation = etree.fromstring(self.read(PRESENTATION))
+        self._presentation_rels = self.relationships(PRESENTATION)
+        self._content_types = etree.fromstring(self.read(CONTENT_TYPES))
+        self._slides = self.slide_parts()
+        # name -> new bytes, or (package, name) to copy raw from another package
+        self._written: Dict[str, Union[bytes, Tuple[PptxPackage, str]]] = {}
+        self._removed: Set[str] = set()
+        self._orphan_candidates: Set[str] = set()
+        self._next_slide_number = 1 + max(
+            (int(posixpath.basename(p)[5:-4]) for p in self.zip.namelist()
+             if p.startswith("ppt/slides/slide") and p.endswith(".xml")),
+            default=0,
+        )
+        self._next_r_id = 1 + max(
+            (int(rel.get("Id")[3:]) for rel in self._presentation_rels if rel.get("Id")[3:].isdigit()),
+            default=0,
+        )
+        self._next_slide_id = 1 + max((int(s.get("id")) for s in self._sld_id_list()), default=255)
+
+    # ---- package state ----
+
+    def _exists(self, name: str) -> bool:
+        if name in self._removed:
+            return False
+        return name in self._written or name in self.zip.NameToInfo
+
+    def _remove(self, name: str):
+        self._written.pop(name, None)
+        if name in self.zip.NameToInfo:
+            self._removed.add(name)
+
+    def _write(self, name: str, data):
+        self._removed.discard(name)
+        self._written[name] = data
+
+    def __len__(self):
+        return len(self._slides)
+
+    # ---- slide operations ----
+
+    def _sld_id_list(self):
+        sld_id_lst = self._presentation.find(f"{{{NS_P}}}sldIdLst")
+        if sld_id_lst is None:
+            sld_id_lst = etree.Element(f"{{{NS_P}}}sldIdLst")
+            anchor = self._presentation.find(f"{{{NS_P}}}sldSz")
+            if anchor is None:
+                self._presentation.append(sld_id_lst)
+            else:
+                anchor.addprevious(sld_id_lst)
+        return sld_id_lst
+
+    def _drop_slide_parts(self, part: str):
+        """Remove a slide part and its rels, remembering its media for pruning"""
+        for rel in self._relationships_of(part):
+            if rel.get("Type") == RT_IMAGE and rel.get("TargetMode") != "External":
+                self._orphan_candidates.add(resolve_target(part, rel.get("Target")))
+        self._remove(part)
+        self._remove(rels_path(part))
+
+    def _relationships_of(self, part: str):
+        name = rels_path(part)
+        data = self._written.get(name)
+        if isinstance(data, bytes):
+            return etree.fromstring(data)
+        return self.relationships(part) if self._exists(name) else []
+
+    def _import_slide(self, source: PptxPackage, source_part: str, part: str):
+        """Copy a slide part from ``source`` to ``part``, bringing its media along"""
+        rels = source.relationships(source_part)
+        for rel in rels:
+            if rel.get("TargetMode") == "External":
+                continue
+            rel_type = rel.get("Type")
+            source_target = resolve_target(source_part, rel.get("Target"))
+            if rel_type == RT_SLIDE_LAYOUT:
+                # Both decks come from the default template, so layouts line up by name
+                target = resolve_target(part, rel.get("Target"))
+                if not self._exists(target):
+                    raise ValueError(f"Layout {target} is missing from the target deck")
+            elif rel_type == RT_IMAGE:
+                data = source.read(source_target)
+                ext = posixpath.splitext(source_target)[1]
+                target = f"ppt/media/image-{hashlib.sha1(data).hexdigest()[:16]}{ext}"
+                if not self._exists(target):
+                    self._write(target, (source, source_target))
+                    self._ensure_default_content_type(source, ext[1:])
+                rel.set("Target", posixpath.relpath(target, posixpath.dirname(part)))
+            else:
+                raise ValueError(f"Unsupported slide relationship {rel_type}")
+
+        self._write(part, (source, source_part))
+        self._write(rels_path(part), _serialize(rels))
+
+    def _ensure_default_content_type(self, source: PptxPackage, ext: str):
+        defaults = {d.get("Extension").lower() for d in self._content_types.iter(f"{{{NS_CT}}}Default")}
+        if ext.lower() in defaults:
+            return
+        source_types = etree.fromstring(source.read(CONTENT_TYPES))
+        for default in source_types.iter(f"{{{NS_CT}}}Default"):
+            if default.get("Extension").lower() == ext.lower():
+                self._content_types.insert(0, copy.deepcopy(default))
+                return
+        raise ValueError(f"No content type for .{ext} media")
+
+    def _check_index(self, index: int, allow_end: bool = False):
+        upper = len(self._slides) if allow_end else len(self._slides) - 1
+        if not 0 <= index <= upper:
+            raise IndexError(f"Slide index {index} out of range")
+
+    def replace_slide(self, index: int, source: PptxPackage, source_part: Optional[str] = None):
+        """Replace the slide at ``index`` with ``source_part`` (default: the first slide of ``source``)"""
+        self._check_index(index)
+        part = self._slides[index]
+        self._drop_slide_parts(part)
+        self._import_slide(source, source_part or source.slide_parts()[0], part)
+
+    def insert_slide(self, index: int, source: PptxPackage, source_part: Optional[str] = None):
+        """Insert ``source_part`` so that it becomes slide ``index``"""
+        self._check_index(index, allow_end=True)
+        part = f"ppt/slides/slide{self._next_slide_number}.xml"
+        self._next_slide_number += 1
+        self._import_slide(source, source_part or source.slide_parts()[0], part)
+
+        r_id = f"rId{self._next_r_id}"
+        self._next_r_id += 1
+        etree.SubElement(
+            self._presentation_rels, f"{{{NS_RELS}}}Relationship",
+            Id=r_id, Type=RT_SLIDE, Target=posixpath.relpath(part, "ppt"),
+        )
+        etree.SubElement(
+            self._content_types, f"{{{NS_CT}}}Override", PartName="/" + part, ContentType=CT_SLIDE
+        )
+
+        sld_id = etree.Element(f"{{{NS_P}}}sldId", id=str(self._next_slide_id))
+        self._next_slide_id += 1
+        sld_id.set(f"{{{NS_R}}}id", r_id)
+        self._sld_id_list().insert(index, sld_id)
+        self._slides.insert(index, part)
+
+    def delete_slide(self, index: int):
+        self._check_index(index)
+        part = self._slides.pop(index)
+        sld_id = self._sld_id_list()[index]
+        r_id = sld_id.get(f"{{{NS_R}}}id")
+        sld_id.getparent().remove(sld_id)
+        for rel in list(self._presentation_rels):
+            if rel.get("Id") == r_id:
+                self._presentation_rels.remove(rel)
+        self._remove_override(part)
+        self._drop_slide_parts(part)
+
+    def _remove_override(self, part: str):
+        for override in list(self._content_types.iter(f"{{{NS_CT}}}Override")):
+            if override.get("PartName") == "/" + part:
+                self._content_types.remove(override)
+
+    # ---- output ----
+
+    def _prune_media(self):
+        """Drop media that were used only by removed or replaced slides"""
+        candidates = {m for m in self._orphan_candidates if self._exists(m)}
+        if not candidates:
+            return
+        names = [n for n in set(self.zip.namelist()) | set(self._written) if n.endswith(".rels")]
+        for name in names:
+            if not self._exists(name):
+                continue
+            owner = posixpath.join(posixpath.dirname(posixpath.dirname(name)), posixpath.basename(name)[:-5])
+            for rel in self._relationships_of(owner):
+                if rel.get("TargetMode") != "External":
+                    candidates.discard(resolve_target(owner, rel.get("Target")))
+            if not candidates:
+                return
+        for media in candidates:
+            self._remove(media)
+            self._remove_override(media)
+
+    def save(self, path: str):
+        self._prune_media()
+        self._written[PRESENTATION] = _serialize(self._presentation)
+        self._written[rels_path(PRESENTATION)] = _serialize(self._presentation_rels)
+        self._written[CONTENT_TYPES] = _serialize(self._content_types)
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as out:
+            pending = dict(self._written)
+            for info in self.zip.infolist():
+                if info.filename in self._removed:
+                    continue
+                if info.filename in pending:
+                    _write_entry(out, info.filename, pending.pop(info.filename))
+                else:
+                    _copy_raw(out, self, info.filename)
+            for name, data in pending.items():
+                _write_entry(out, name, data)
+
+
+def _write_entry(out: zipfile.ZipFile, name: str, data):
+    if isinstance(data, bytes):
+        out.writestr(name, data)
+    else:
+        source, source_name = data
+        _copy_raw(out, source, source_name, name)
+
+
+def _copy_raw(out: zipfile.ZipFile, source: PptxPackage, name: str, new_name: Optional[str] = None):
+    """Append an entry's compressed bytes to ``out`` as-is, mirroring what ZipFile.write does"""
+    info, payload = source.raw_entry(name)
+    info = copy.copy(info)
+    if new_name is not None:
+        info.filename = info.orig_filename = new_name
+    info.flag_bits &= ~0x08  # sizes are known, no data descriptor
+    out.fp.seek(out.start_dir)
+    info.header_offset = out.fp.tell()
+    out.fp.write(info.FileHeader())
+    out.fp.write(payload)
+    out.filelist.append(info)
+    out.NameToInfo[info.filename] = info
+    out.start_dir = out.fp.tell()
@@ -0,0 +1,147 @@
+"""
+Opt-in sampling profiler for Celery tasks.
+
+A background thread snapshots the task thread's stack every
+``PROFILING_INTERVAL_MS``. Profiles are kept for a random
+``PROFILING_SAMPLE_RATE`` fraction of tasks and for every task slower than
+``PROFILING_LATENCY_THRESHOLD`` seconds, and are stored in the result backend
+next to the task result. Nothing is hooked into the worker unless
+``PROFILING_ENABLED`` is set, so a disabled profiler costs nothing.
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY_PREFIX = "celery-task-profile-"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sample the stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="task-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+
+def to_collapsed(profile: Dict) -> str:
+    """Brendan Gregg's collapsed stack format (``a;b;c count``), one stack per line"""
+    return "\n".join(f"{';'.join(stack)} {count}" for stack, count in profile["samples"]) + "\n"
+
+
+def to_speedscope(profile: Dict) -> Dict:
+    """Speedscope sampled-profile JSON (https://www.speedscope.app/file-format-schema.json)"""
+    frames: List[Dict] = []
+    index: Dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in profile["samples"]:
+        indices = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            indices.append(index[label])
+        samples.append(indices)
+        weights.append(count * profile["interval_ms"])
+
+    name = f"{profile['task_name']} {profile['task_id']}"
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "presentation-generator",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def store_profile(backend, profile: Dict):
+    backend.set(PROFILE_KEY_PREFIX + profile["task_id"], json.dumps(profile))
+
+
+def load_profile(backend, task_id: str) -> Optional[Dict]:
+    raw = backend.get(PROFILE_KEY_PREFIX + task_id)
+    return json.loads(raw) if raw else None
+
+
+class TaskProfiler:
+    """Decides which tasks to profile and stores the kept profiles"""
+
+    def __init__(self):
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.threshold = settings.PROFILING_LATENCY_THRESHOLD
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000.0
+        # task_id -> (profiler, start time, sampled)
+        self._running: Dict[str, Tuple[SamplingProfiler, float, bool]] = {}
+
+    def start(self, task_id: str):
+        sampled = random.random() < self.sample_rate
+        if not sampled and self.threshold <= 0:
+            return
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        profiler.start()
+        self._running[task_id] = (profiler, time.perf_counter(), sampled)
+
+    def finish(self, task_id: str, task_name: str, backend):
+        entry = self._running.pop(task_id, None)
+        if entry is None:
+            return
+        profiler, started, sampled = entry
+        profiler.stop()
+        duration = time.perf_counter() - started
+        if not sampled and duration < self.threshold:
+            return
+
+        profile = {
+            "task_id": task_id,
+            "task_name": task_name,
+            "duration": duration,
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+            "reason": "sampled" if sampled else "slow",
+            "samples": [[list(stack), count] for stack, count in profiler.samples.most_common()],
+        }
+        try:
+            store_profile(backend, profile)
+        except Exception as e:
+            logger.error(f"Could not store profile for task {task_id}: {e}")
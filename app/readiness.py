@@ -0,0 +1,209 @@
+"""
+Readiness and deep health checks for load balancers and autoscalers.
+
+``ReadinessProbe`` checks broker and result backend connectivity, live
+workers and their capacity (Celery inspect), queue depth and the age of the
+oldest waiting message, and free space under ``STORAGE_PATH``. The checks
+run in a background loop and the endpoints only read the cached snapshot,
+so probe traffic does not reach Redis or the workers.
+"""
+import asyncio
+import json
+import logging
+import math
+import shutil
+import time
+from typing import Dict, Optional
+
+from prometheus_client import Gauge
+
+from app.config import settings
+from app.metrics import CACHE_REQUESTS, CELERY_QUEUES
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ALIVE = Gauge("celery_workers_alive", "Workers answering Celery inspect", multiprocess_mode="max")
+OLDEST_MESSAGE_AGE = Gauge(
+    "celery_oldest_message_age_seconds", "Age of the oldest message waiting in the queue", multiprocess_mode="max"
+)
+LOAD_FACTOR = Gauge(
+    "scaling_load_factor", "(queued + running tasks) / worker pool capacity", multiprocess_mode="max"
+)
+
+
+class ReadinessProbe:
+    """Runs the dependency checks and caches the latest snapshot"""
+
+    def __init__(self, celery_app):
+        self.celery_app = celery_app
+        self.snapshot: Optional[Dict] = None
+        self.checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._redis = None
+
+    # ---- individual checks (blocking, run in a thread) ----
+
+    def _check_broker(self) -> Dict:
+        try:
+            with self.celery_app.connection_for_read() as conn:
+                conn.ensure_connection(max_retries=1, timeout=settings.READINESS_CHECK_TIMEOUT)
+            return {"ok": True}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def _check_backend(self) -> Dict:
+        try:
+            backend = self.celery_app.backend
+            client = getattr(backend, "client", None)
+            if client is not None and hasattr(client, "ping"):
+                client.ping()
+            else:
+                backend.get("readiness-probe")
+            return {"ok": True}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def _check_workers(self) -> Dict:
+        """
+        One ``stats`` broadcast waits the full timeout to discover workers;
+        the ``active`` broadcast then stops as soon as those workers replied.
+        """
+        control = self.celery_app.control
+        try:
+            stats = control.inspect(timeout=settings.READINESS_CHECK_TIMEOUT).stats() or {}
+            active = {}
+            if stats:
+                active = control.inspect(timeout=settings.READINESS_CHECK_TIMEOUT, limit=len(stats)).active() or {}
+        except Exception as e:
+            return {"ok": False, "alive": 0, "capacity": 0, "active": 0, "error": str(e)}
+
+        capacity = sum(s.get("pool", {}).get("max-concurrency", 1) for s in stats.values())
+        running = sum(len(tasks) for tasks in active.values())
+        return {"ok": bool(stats), "alive": len(stats), "capacity": capacity, "active": running}
+
+    def _broker(self):
+        """One Redis client (and connection pool) for the life of the probe"""
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.READINESS_CHECK_TIMEOUT,
+                socket_connect_timeout=settings.READINESS_CHECK_TIMEOUT,
+            )
+        return self._redis
+
+    def _check_queue(self) -> Dict:
+        """Queue depth and oldest message age, read straight from the Redis lists"""
+        if not settings.REDIS_URL.startswith(("redis://", "rediss://")):
+            return {"depth": None, "oldest_age_seconds": None}
+        try:
+            client = self._broker()
+            depth, oldest_age = 0, 0.0
+            for queue in CELERY_QUEUES:
+                # kombu LPUSHes and BRPOPs, so the oldest message is the last element
+                with client.pipeline() as pipe:
+                    pipe.llen(queue)
+                    pipe.lindex(queue, -1)
+                    length, oldest = pipe.execute()
+                depth += length
+                if oldest:
+                    published_at = json.loads(oldest).get("headers", {}).get("published_at")
+                    if published_at:
+                        oldest_age = max(oldest_age, time.time() - float(published_at))
+            return {"depth": depth, "oldest_age_seconds": round(oldest_age, 3)}
+        except Exception as e:
+            return {"depth": None, "oldest_age_seconds": None, "error": str(e)}
+
+    def _check_storage(self) -> Dict:
+        try:
+            usage = shutil.disk_usage(settings.STORAGE_PATH)
+        except OSError as e:
+            return {"ok": False, "error": str(e)}
+        return {
+            "ok": usage.free >= settings.READINESS_MIN_FREE_BYTES,
+            "free_bytes": usage.free,
+            "total_bytes": usage.total,
+        }
+
+    # ---- snapshot ----
+
+    def check(self) -> Dict:
+        broker = self._check_broker()
+        backend = self._check_backend()
+        workers = self._check_workers()
+        queue = self._check_queue()
+        storage = self._check_storage()
+
+        queued = queue.get("depth") or 0
+        demand = queued + workers["active"]
+        capacity = workers["capacity"]
+        per_worker = capacity / workers["alive"] if workers["alive"] else 1
+        load_factor = demand / capacity if capacity else float(demand)
+
+        ready = broker["ok"] and backend["ok"] and storage["ok"]
+        if not ready:
+            status = "unhealthy"
+        elif not workers["ok"]:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        WORKERS_ALIVE.set(workers["alive"])
+        OLDEST_MESSAGE_AGE.set(queue.get("oldest_age_seconds") or 0)
+        LOAD_FACTOR.set(load_factor)
+
+        return {
+            "status": status,
+            "ready": ready,
+            "checks": {
+                "broker": broker,
+                "backend": backend,
+                "workers": workers,
+                "queue": queue,
+                "storage": storage,
+            },
+            "scaling": {
+                "load_factor": round(load_factor, 3),
+                "desired_workers": math.ceil(demand / per_worker) if demand else 0,
+            },
+            "checked_at": time.time(),
+        }
+
+    async def refresh(self) -> Dict:
+        async with self._lock:
+            self.snapshot = await asyncio.to_thread(self.check)
+            self.checked_at = time.monotonic()
+        return self.snapshot
+
+    async def get(self) -> Dict:
+        """Cached snapshot; only the first call (or a stalled refresh loop) runs the checks inline"""
+        age = time.monotonic() - self.checked_at
+        if self.snapshot is not None and age < settings.READINESS_CACHE_TTL:
+            CACHE_REQUESTS.labels("readiness", "hit").inc()
+            return self.snapshot
+        CACHE_REQUESTS.labels("readiness", "miss").inc()
+        if self._lock.locked() and self.snapshot is not None:
+            return self.snapshot
+        return await self.refresh()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Readiness refresh failed: {e}")
+            await asyncio.sleep(settings.READINESS_REFRESH_INTERVAL)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._redis is not None:
+            self._redis.close()
+            self._redis = None
@@ -0,0 +1,50 @@
+"""
+Render a ``PresentationRequest`` and build the task-style result.
+
+Shared by the Celery tasks and the API's inline fast path (``app.inline``),
+so both produce the same files, history entries and result payloads.
+"""
+import logging
+import os
+import time
+from typing import Optional
+
+from app import history
+from app.models import PresentationRequest
+from app.ppt_generator import PPTGenerator
+
+logger = logging.getLogger(__name__)
+
+
+def render_presentation(request: PresentationRequest, owner: Optional[str] = None,
+                        task_id: Optional[str] = None) -> dict:
+    """Render the deck, record it in the owner's history and build the task result"""
+    generator = PPTGenerator()
+    start = time.perf_counter()
+    file_path = generator.generate_presentation(request, owner)
+    render_seconds = time.perf_counter() - start
+
+    # In a real application, you might upload to S3 or similar
+    file_name = os.path.basename(file_path)
+    file_url = f"/download/{file_name}"
+    presentation_id = os.path.splitext(file_name)[0]
+
+    if owner and history.enabled():
+        try:
+            history.record(owner, presentation_id, {
+                "title": request.title,
+                "slide_count": len(request.slides),
+                "size_bytes": os.path.getsize(file_path),
+                "render_seconds": round(render_seconds, 3),
+                "file_key": file_name,
+                "task_id": task_id or "",
+            })
+        except Exception as e:
+            logger.warning(f"Could not record presentation history: {e}")
+
+    return {
+        "status": "completed",
+        "file_url": file_url,
+        "presentation_id": presentation_id,
+        "message": "Presentation generated successfully"
+    }
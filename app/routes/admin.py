@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.auth import get_admin_user, TokenData
+from app.profiling import load_profile, to_collapsed, to_speedscope
+from celery_app import app as celery_app
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+@router.get("/profiles/{task_id}")
+async def get_task_profile(
+        task_id: str,
+        format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+        admin: TokenData = Depends(get_admin_user)
+):
+    """
+    Task profilini olish (Admin JWT required)
+
+    Args:
+        task_id: Celery task ID
+        format: speedscope (JSON) yoki collapsed (flamegraph uchun matn)
+        admin: Admin foydalanuvchi (JWT dan)
+
+    Returns:
+        Speedscope JSON yoki collapsed stack matni
+
+    Raises:
+        HTTPException: Profil topilmasa
+    """
+    profile = load_profile(celery_app.backend, task_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profil topilmadi")
+
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(profile))
+    return JSONResponse(
+        to_speedscope(profile),
+        headers={"Content-Disposition": f'attachment; filename="{task_id}.speedscope.json"'}
+    )
@@ -0,0 +1,270 @@
+"""
+Condense extracted PDF text to a token budget before the LLM call.
+
+``condense`` works on the per-page text from ``PDFProcessor`` (pages are
+separated by form feeds):
+
+1. normalizes it: Unicode compatibility forms, whitespace runs, hyphenated
+   line breaks, bare page numbers;
+2. drops boilerplate, i.e. short lines at the top or bottom of a page that
+   repeat on many pages (ignoring a page number at either end), such as
+   running headers and footers;
+3. reflows lines into paragraphs, removes exact duplicates and splits
+   long paragraphs into passages at sentence (or, failing that, word)
+   boundaries;
+4. if the result is still over budget, scores each passage by how central
+   its vocabulary is to the document and packs the best ones, in original
+   order, into exactly ``budget`` tokens of the model's tokenizer.
+"""
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+PAGE_SEPARATOR = "\f"
+PARAGRAPH_SEPARATOR = "\n\n"
+
+# Passages longer than this are split at sentence boundaries
+MAX_PASSAGE_TOKENS = 200
+# A short edge line repeated on at least this share of pages (and at least 3) is boilerplate
+BOILERPLATE_PAGE_SHARE = 0.5
+# Only this many lines at the top and at the bottom of a page, of at most this length, can be boilerplate
+BOILERPLATE_EDGE_LINES = 3
+BOILERPLATE_MAX_CHARS = 80
+
+_PAGE_NUMBER = re.compile(r"^[-\s]*(page\s*)?\d+(\s*(of|/)\s*\d+)?[-\s]*$", re.IGNORECASE)
+_EDGE_NUMBER = re.compile(r"^\d+[\s|:.,\-\u2013\u2014]+|[\s|:.,\-\u2013\u2014]+(page\s*)?\d+$", re.IGNORECASE)
+_HYPHEN_BREAK = re.compile(r"(\w)-[ \t]*\n[ \t]*(?=[a-z])")
+_SPACES = re.compile(r"[ \t ]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_WORD = re.compile(r"[^\W\d_]{3,}")
+
+STOPWORDS = frozenset("""
+the and for are but not you all any can had her was one our out has have him his how its may new now
+own see two way who did get got let put say she too use with this that from they will would there their
+what when which were been than then them these those into also such more most some only other over
+each very just about after before being between both because while where whose could should does
+""".split())
+
+
+@dataclass
+class CondensedText:
+    text: str
+    input_tokens: int
+    output_tokens: int
+    pages: int
+    boilerplate_lines: int = 0
+    passages_kept: int = 0
+    passages_total: int = 0
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer for {model} unavailable ({e}); estimating tokens from characters")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Token count with the model's tokenizer, or a conservative estimate when it cannot be loaded"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / 3)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _line_key(line: str) -> str:
+    """
+    Running headers often carry the page number ("Annual Report | 7"), so a
+    number at either end is ignored, unless that leaves a single word
+    ("Chapter 7" is a heading, not a header).
+    """
+    line = line.lower()
+    rest = _EDGE_NUMBER.sub("", line).strip()
+    return rest if len(rest.split()) >= 2 else line
+
+
+def _edge_lines(lines: List[str]) -> List[int]:
+    """Indexes of the short lines among the first and last few non-empty lines of a page"""
+    filled = [i for i, line in enumerate(lines) if line]
+    edges = set(filled[:BOILERPLATE_EDGE_LINES] + filled[-BOILERPLATE_EDGE_LINES:])
+    return sorted(i for i in edges if len(lines[i]) <= BOILERPLATE_MAX_CHARS)
+
+
+def normalize_pages(text: str) -> List[List[str]]:
+    """Per page, the cleaned non-empty lines (paragraph breaks kept as empty strings)"""
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    pages = []
+    for page in text.split(PAGE_SEPARATOR):
+        page = _HYPHEN_BREAK.sub(r"\1", page)
+        lines = []
+        for line in page.split("\n"):
+            line = _SPACES.sub(" ", line).strip()
+            if line and _PAGE_NUMBER.match(line):
+                continue
+            if line or (lines and lines[-1]):
+                lines.append(line)
+        pages.append(lines)
+    return pages
+
+
+def drop_boilerplate(pages: List[List[str]]) -> int:
+    """Remove headers and footers repeated across many pages in place; returns how many lines were removed"""
+    if len(pages) < 3:
+        return 0
+    edges = [_edge_lines(lines) for lines in pages]
+    seen_on = Counter()
+    for lines, indexes in zip(pages, edges):
+        seen_on.update({_line_key(lines[i]) for i in indexes})
+    threshold = max(3, BOILERPLATE_PAGE_SHARE * len(pages))
+    boilerplate = {key for key, count in seen_on.items() if count >= threshold}
+    if not boilerplate:
+        return 0
+
+    removed = 0
+    for lines, indexes in zip(pages, edges):
+        drop = {i for i in indexes if _line_key(lines[i]) in boilerplate}
+        lines[:] = [line for i, line in enumerate(lines) if i not in drop]
+        removed += len(drop)
+    return removed
+
+
+def passages(pages: List[List[str]], model: str, max_tokens: int = MAX_PASSAGE_TOKENS) -> List[str]:
+    """Reflow lines into paragraphs, split long ones at sentences and drop exact duplicates"""
+    paragraphs, current = [], []
+    for lines in pages:
+        for line in lines + [""]:
+            if line:
+                current.append(line)
+            elif current:
+                paragraphs.append(" ".join(current))
+                current = []
+
+    result, seen = [], set()
+    for paragraph in paragraphs:
+        if paragraph in seen:
+            continue
+        seen.add(paragraph)
+        result.extend(_split_long(paragraph, model, max_tokens))
+    return result
+
+
+def _split_long(text: str, model: str, max_tokens: int = MAX_PASSAGE_TOKENS) -> List[str]:
+    """Pieces of at most ``max_tokens``: whole sentences where possible, else runs of words"""
+    tokens = count_tokens(text, model)
+    if tokens <= max_tokens:
+        return [text]
+
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence_tokens = count_tokens(sentence, model)
+        if sentence_tokens <= max_tokens:
+            pieces.append((sentence, sentence_tokens))
+            continue
+        words = sentence.split(" ")
+        step = max(1, len(words) * max_tokens // (2 * sentence_tokens))
+        for start in range(0, len(words), step):
+            piece = " ".join(words[start:start + step])
+            pieces.append((piece, count_tokens(piece, model)))
+
+    chunks, chunk, chunk_tokens = [], [], 0
+    for piece, piece_tokens in pieces:
+        if chunk and chunk_tokens + piece_tokens > max_tokens:
+            chunks.append(" ".join(chunk))
+            chunk, chunk_tokens = [], 0
+        chunk.append(piece)
+        chunk_tokens += piece_tokens
+    if chunk:
+        chunks.append(" ".join(chunk))
+    return chunks
+
+
+def truncate_tokens(text: str, budget: int, model: str) -> str:
+    """The longest prefix of ``text`` that fits into ``budget`` tokens"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max(0, budget) * 3]
+    text = encoding.decode(encoding.encode(text, disallowed_special=())[:max(0, budget)])
+    # Decoded text can re-encode to a few more tokens at the cut
+    while text and count_tokens(text, model) > budget:
+        text = text[:-1]
+    return text
+
+
+def score_passages(items: List[str]) -> List[float]:
+    """
+    Centrality: mean log document frequency of a passage's content words,
+    with a small boost for the opening passages (abstracts, introductions).
+    """
+    words = [[w for w in _WORD.findall(p.lower()) if w not in STOPWORDS] for p in items]
+    frequency = Counter(w for ws in words for w in set(ws))
+    scores = []
+    for position, ws in enumerate(words):
+        unique = set(ws)
+        centrality = sum(math.log1p(frequency[w]) for w in unique) / math.sqrt(len(unique)) if unique else 0.0
+        position_boost = 1.25 if position < max(3, len(items) // 20) else 1.0
+        scores.append(centrality * position_boost)
+    return scores
+
+
+def condense(text: str, budget: int, model: str) -> CondensedText:
+    """Clean ``text`` and fit it into ``budget`` tokens of ``model``'s tokenizer"""
+    input_tokens = count_tokens(text, model)
+    pages = normalize_pages(text)
+    original = [list(lines) for lines in pages]
+    removed = drop_boilerplate(pages)
+    # Passages must fit the budget on their own, or none could be selected
+    max_tokens = max(1, min(MAX_PASSAGE_TOKENS, budget))
+    items = passages(pages, model, max_tokens)
+    if not items and removed:
+        # Everything looked like boilerplate (e.g. one-line pages); better the repeats than nothing
+        pages, removed = original, 0
+        items = passages(pages, model, max_tokens)
+
+    cleaned = PARAGRAPH_SEPARATOR.join(items)
+    cleaned_tokens = count_tokens(cleaned, model)
+    if cleaned_tokens <= budget:
+        return CondensedText(cleaned, input_tokens, cleaned_tokens, len(pages), removed, len(items), len(items))
+
+    # Greedy by score, then restore document order
+    costs = [count_tokens(item, model) for item in items]
+    separator_cost = count_tokens(PARAGRAPH_SEPARATOR, model)
+    scores = score_passages(items)
+    ranked = sorted(range(len(items)), key=lambda i: scores[i], reverse=True)
+    chosen, used = set(), 0
+    for i in ranked:
+        cost = costs[i] + (separator_cost if chosen else 0)
+        if used + cost <= budget:
+            chosen.add(i)
+            used += cost
+
+    # Tokens can merge differently across separators; trim the weakest until the exact count fits
+    while True:
+        selected = [items[i] for i in sorted(chosen)]
+        condensed = PARAGRAPH_SEPARATOR.join(selected)
+        output_tokens = count_tokens(condensed, model)
+        if output_tokens <= budget or not chosen:
+            break
+        chosen.discard(min(chosen, key=lambda i: scores[i]))
+
+    if not chosen and items:
+        # Not even one passage fits (e.g. a single unbreakable run): keep the best one, cut to the budget
+        best = max(range(len(items)), key=lambda i: scores[i])
+        condensed = truncate_tokens(items[best], budget, model)
+        output_tokens = count_tokens(condensed, model)
+        return CondensedText(condensed, input_tokens, output_tokens, len(pages), removed, 1, len(items))
+
+    return CondensedText(condensed, input_tokens, output_tokens, len(pages), removed, len(chosen), len(items))
@@ -0,0 +1,132 @@
+"""
+OpenTelemetry tracing for the API and the Celery workers.
+
+The API opens a span per request; the trace context travels to the worker
+in the Celery message headers, so one trace covers queueing, PDF parsing,
+the OpenAI call, each rendered slide and the final save.
+
+The exporter is chosen with ``TRACING_EXPORTER``:
+
+- ``none``: tracing disabled (no-op tracer)
+- ``console``: spans printed to stdout
+- ``file``: one JSON document per line in ``TRACING_FILE_PATH`` (works offline)
+- ``memory``: kept in ``memory_exporter``, for tests
+- ``otlp``: OTLP/HTTP, needs ``opentelemetry-exporter-otlp-proto-http``
+
+Other exporters can be added with ``register_exporter``.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from opentelemetry import context, propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("presentation_generator")
+
+memory_exporter = InMemorySpanExporter()
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file as JSON lines"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        lines = "".join(json.dumps(json.loads(span.to_json())) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _otlp_exporter() -> SpanExporter:
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    return OTLPSpanExporter()
+
+
+# name -> (factory, batch); batched processors export from a background thread
+_EXPORTERS: Dict[str, Tuple[Callable[[], SpanExporter], bool]] = {
+    "console": (ConsoleSpanExporter, True),
+    "file": (lambda: FileSpanExporter(settings.TRACING_FILE_PATH), False),
+    "memory": (lambda: memory_exporter, False),
+    "otlp": (_otlp_exporter, True),
+}
+
+
+def register_exporter(name: str, factory: Callable[[], SpanExporter], batch: bool = True):
+    """Make a custom exporter selectable through ``TRACING_EXPORTER``"""
+    _EXPORTERS[name] = (factory, batch)
+
+
+def configure_tracing(service_name: str, exporter: Optional[str] = None) -> bool:
+    """
+    Install the global tracer provider for this process.
+
+    Call it once per process, after forking (prefork workers). Returns
+    False when tracing is disabled.
+    """
+    name = exporter or settings.TRACING_EXPORTER
+    if not name or name == "none":
+        return False
+    if name not in _EXPORTERS:
+        logger.error(f"Unknown TRACING_EXPORTER '{name}', tracing disabled")
+        return False
+
+    factory, batch = _EXPORTERS[name]
+    processor_cls = BatchSpanProcessor if batch else SimpleSpanProcessor
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(processor_cls(factory()))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+def inject_headers(headers: dict):
+    """Write the current trace context into a message headers dict"""
+    propagate.inject(headers)
+
+
+def inject_environ(environ: dict):
+    """Write the current trace context into a child process environment (TRACEPARENT, TRACESTATE)"""
+    carrier = {}
+    propagate.inject(carrier)
+    environ.update({key.upper(): value for key, value in carrier.items()})
+
+
+def extract_environ(environ=None) -> context.Context:
+    """Trace context passed to this process by ``inject_environ``"""
+    environ = os.environ if environ is None else environ
+    fields = propagate.get_global_textmap().fields
+    return propagate.extract({field: environ[field.upper()] for field in fields if field.upper() in environ})
+
+
+def extract_context(source) -> context.Context:
+    """Trace context from a headers dict or an object carrying them as attributes (Celery request)"""
+    if isinstance(source, dict):
+        return propagate.extract(source)
+    carrier = {}
+    for field in propagate.get_global_textmap().fields:
+        value = getattr(source, field, None)
+        if value is not None:
+            carrier[field] = value
+    return propagate.extract(carrier)
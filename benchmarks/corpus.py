@@ -0,0 +1,148 @@
+"""
+Synthetic inputs for the benchmark suites.
+
+Everything here is generated on the fly so runs are reproducible without
+shipping binary fixtures.
+"""
+import random
+from typing import List
+
+WORDS = (
+    "presentation slide market growth revenue quarter customer product team "
+    "strategy analysis data model result summary overview research design "
+    "process system network service platform report budget forecast risk"
+).split()
+
+
+def lorem(n_words: int, seed: int = 0) -> str:
+    """Deterministic filler text"""
+    rnd = random.Random(seed)
+    return " ".join(rnd.choice(WORDS) for _ in range(n_words))
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: int, lines_per_page: int = 30, seed: int = 0) -> bytes:
+    """
+    Build a minimal text PDF with the given number of pages.
+
+    Each page carries a running header, body lines and a page number footer,
+    which is what PyPDF2 sees in real uploads.
+    """
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog_id = add(b"")  # placeholder, filled in below
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_no in range(1, pages + 1):
+        lines = ["Quarterly Report - Confidential"]
+        lines += [lorem(12, seed=seed * 100003 + page_no * 101 + i) for i in range(lines_per_page)]
+        lines.append(f"Page {page_no} of {pages}")
+
+        stream = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in lines:
+            stream.append(f"({_pdf_escape(line)}) Tj T*")
+        stream.append("ET")
+        data = "\n".join(stream).encode("latin-1")
+
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font_id, content_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n" % (len(objects) + 1)
+    out += b"0000000000 65535 f \n"
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\n" % (len(objects) + 1, catalog_id)
+    out += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return bytes(out)
+
+
+def small_presentation_request(seed: int = 0) -> dict:
+    """A 3-slide JSON PresentationRequest payload"""
+    return {
+        "title": f"Benchmark deck {seed}",
+        "author": "bench",
+        "theme": "default",
+        "slides": [
+            {"type": "title", "title": "Welcome", "content": lorem(6, seed)},
+            {"type": "content", "title": "Overview", "content": lorem(60, seed + 1)},
+            {"type": "bullet_points", "title": "Key points",
+             "bullet_points": [lorem(8, seed + i) for i in range(5)]},
+        ],
+    }
+
+
+SLIDE_TYPES = ("title", "content", "bullet_points", "two_column", "image")
+
+
+def png_data_url(width: int = 320, height: int = 240, seed: int = 0) -> str:
+    """Small generated PNG as a data URL, used for image slides"""
+    import base64
+    import io
+    from PIL import Image
+
+    rnd = random.Random(seed)
+    image = Image.new("RGB", (width, height), tuple(rnd.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def make_slide(slide_type: str, index: int, image_url: str = None) -> dict:
+    title = f"Slide {index + 1}: {lorem(4, index)}"
+    if slide_type == "title":
+        return {"type": "title", "title": title, "content": lorem(8, index)}
+    if slide_type == "content":
+        return {"type": "content", "title": title, "content": lorem(80, index)}
+    if slide_type == "bullet_points":
+        return {"type": "bullet_points", "title": title,
+                "bullet_points": [lorem(10, index * 7 + i) for i in range(5)]}
+    if slide_type == "two_column":
+        return {"type": "two_column", "title": title,
+                "column1": lorem(40, index), "column2": lorem(40, index + 1)}
+    if slide_type == "image":
+        return {"type": "image", "title": title, "image_url": image_url or png_data_url(seed=index % 8)}
+    raise ValueError(f"Unknown slide type: {slide_type}")
+
+
+def make_deck(n_slides: int, slide_type: str = "mixed") -> dict:
+    """
+    PresentationRequest payload with ``n_slides`` slides.
+
+    ``slide_type`` is one of ``SLIDE_TYPES`` or ``"mixed"``, which cycles
+    through all of them.
+    """
+    images = [png_data_url(seed=i) for i in range(8)]
+    slides = []
+    for i in range(n_slides):
+        kind = SLIDE_TYPES[i % len(SLIDE_TYPES)] if slide_type == "mixed" else slide_type
+        slides.append(make_slide(kind, i, image_url=images[i % len(images)]))
+    return {
+        "title": f"{slide_type} deck with {n_slides} slides",
+        "author": "bench",
+        "theme": "default",
+        "slides": slides,
+    }
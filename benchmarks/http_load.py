@@ -0,0 +1,306 @@
+"""
+HTTP load test and latency benchmark for the API.
+
+Boots ``app.main:app`` under uvicorn against a local Redis (a fakeredis
+server unless ``--redis-url`` is given) and a stub OpenAI server, drives a
+weighted mix of endpoints at fixed concurrency and writes p50/p95/p99 and
+requests per second per endpoint to a JSON report.
+
+    python -m benchmarks.http_load --concurrency 32 --duration 30
+    python -m benchmarks.http_load --compare benchmarks/results/http_load.base.json
+
+Use ``--base-url`` to drive an already running deployment instead.
+``submit`` always queues (``sync=false``); add ``submit_inline`` to the mix
+to measure the inline fast path.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from benchmarks.corpus import make_pdf, small_presentation_request
+from benchmarks.report import compare, format_comparison, load_report, percentile, write_report
+from benchmarks.stand_ins import StubOpenAIServer, free_port, local_redis
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = {
+    "submit": 2,
+    "submit_pdf": 1,
+    "status": 4,
+    "pricing_tiers": 2,
+    "pricing_calculate": 2,
+    "auth_login": 1,
+}
+# Endpoints that can be put in --mix; the default mix leaves out the inline fast path
+ENDPOINTS = tuple(DEFAULT_MIX) + ("submit_inline",)
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+class Workload:
+    """Issues one request per call, chosen by weight from the endpoint mix"""
+
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, int], api_key: str, seed: int = 0):
+        self.client = client
+        self.api_key = api_key
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.random = random.Random(seed)
+        self.token: Optional[str] = None
+        self.task_ids: List[str] = []
+        self.pdf = make_pdf(2)
+        self.counter = 0
+
+    async def setup(self):
+        response = await self.client.post("/api/auth/login", json={"api_key": self.api_key})
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+        # Seed a task id so status polling has something to look at
+        response = await self.client.post(
+            "/api/presentations", params={"sync": "false"}, json=small_presentation_request()
+        )
+        if response.status_code == 200:
+            self.task_ids.append(response.json()["task_id"])
+
+    def pick(self) -> str:
+        name = self.random.choices(self.names, self.weights)[0]
+        if name == "status" and not self.task_ids:
+            return "submit"
+        return name
+
+    async def run(self, name: str) -> httpx.Response:
+        self.counter += 1
+        if name in ("submit", "submit_inline"):
+            # submit measures the queued path; submit_inline the in-process fast path
+            response = await self.client.post(
+                "/api/presentations",
+                params={"sync": "false" if name == "submit" else "true"},
+                json=small_presentation_request(self.counter),
+            )
+            if response.status_code == 200:
+                self.task_ids.append(response.json()["task_id"])
+                del self.task_ids[:-1000]
+            return response
+        if name == "submit_pdf":
+            return await self.client.post(
+                "/api/presentations/from-pdf",
+                files={"pdf_file": ("bench.pdf", self.pdf, "application/pdf")},
+                data={"num_slides": "5"},
+            )
+        if name == "status":
+            task_id = self.random.choice(self.task_ids)
+            return await self.client.get(f"/api/presentations/{task_id}")
+        if name == "pricing_tiers":
+            return await self.client.get("/api/pricing/tiers")
+        if name == "pricing_calculate":
+            return await self.client.get(
+                "/api/pricing/calculate",
+                params={"num_slides": self.random.randint(1, 100)},
+                headers={"Authorization": f"Bearer {self.token}"},
+            )
+        if name == "auth_login":
+            return await self.client.post("/api/auth/login", json={"api_key": self.api_key})
+        raise ValueError(f"Unknown endpoint in mix: {name}")
+
+
+async def drive(base_url: str, mix: Dict[str, int], concurrency: int, duration: float,
+                warmup: float, api_key: str, seed: int) -> Dict[str, Dict]:
+    """Run ``concurrency`` closed-loop clients for ``warmup + duration`` seconds"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        workloads = [Workload(client, mix, api_key, seed + i) for i in range(concurrency)]
+        await asyncio.gather(*(w.setup() for w in workloads))
+
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def client_loop(workload: Workload):
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                name = workload.pick()
+                t0 = time.perf_counter()
+                try:
+                    response = await workload.run(name)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                t1 = time.perf_counter()
+                if t0 < measure_from:
+                    continue
+                latencies[name].append((t1 - t0) * 1000.0)
+                if failed:
+                    errors[name] += 1
+
+        await asyncio.gather(*(client_loop(w) for w in workloads))
+        elapsed = time.perf_counter() - measure_from
+
+    results = {}
+    all_samples: List[float] = []
+    for name, samples in sorted(latencies.items()):
+        all_samples.extend(samples)
+        results[name] = summarize(samples, errors[name], elapsed)
+    results["_all"] = summarize(all_samples, sum(errors.values()), elapsed)
+    return results
+
+
+def summarize(samples: List[float], error_count: int, elapsed: float) -> Dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": error_count,
+        "rps": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+
+def wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited early with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy in {timeout}s")
+
+
+@contextmanager
+def spawn(cmd: List[str], env: Dict[str, str], log_path: str) -> Iterator[subprocess.Popen]:
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            yield process
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+@contextmanager
+def local_stack(args) -> Iterator[str]:
+    """Boot the API (and optionally a worker) against local stand-ins"""
+    with ExitStack() as stack:
+        redis_url = args.redis_url or stack.enter_context(local_redis())
+        openai = stack.enter_context(StubOpenAIServer(latency=args.openai_latency))
+        storage = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-storage-"))
+
+        env = dict(
+            os.environ,
+            REDIS_URL=redis_url,
+            RESULT_BACKEND=redis_url,
+            STORAGE_PATH=storage,
+            SPEC_PATH=os.path.join(storage, "specs"),
+            OPENAI_API_KEY="sk-bench",
+            OPENAI_BASE_URL=openai.base_url,
+        )
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+
+        api = stack.enter_context(spawn(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--workers", str(args.api_workers), "--log-level", "warning"],
+            env, os.path.join(storage, "api.log"),
+        ))
+        if args.worker:
+            stack.enter_context(spawn(
+                [sys.executable, "-m", "celery", "-A", "celery_app", "worker",
+                 "--loglevel=warning", f"--concurrency={args.worker_concurrency}"],
+                env, os.path.join(storage, "worker.log"),
+            ))
+
+        wait_until_healthy(base_url, api)
+        yield base_url
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name}'. Choose from: {', '.join(ENDPOINTS)}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"{'endpoint':<20} {'reqs':>8} {'err':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in results.items():
+        print(
+            f"{name:<20} {row['requests']:>8} {row['errors']:>6} {row['rps']:>9.1f} "
+            f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark an already running API instead of booting one")
+    parser.add_argument("--redis-url", help="Use this Redis instead of an in-process fakeredis server")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--mix", help="Endpoint weights, e.g. 'status=4,submit=1'")
+    parser.add_argument("--api-key", default="demo-api-key-12345")
+    parser.add_argument("--api-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--worker", action="store_true", help="Also start a Celery worker")
+    parser.add_argument("--worker-concurrency", type=int, default=2)
+    parser.add_argument("--openai-latency", type=float, default=0.0, help="Stub OpenAI delay in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results", "http_load.json"))
+    parser.add_argument("--compare", metavar="BASELINE", help="Report to compare this run against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged as regression")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "compare")}
+    config["mix"] = mix
+
+    with ExitStack() as stack:
+        base_url = args.base_url or stack.enter_context(local_stack(args))
+        results = asyncio.run(drive(
+            base_url, mix, args.concurrency, args.duration, args.warmup, args.api_key, args.seed
+        ))
+
+    report = write_report(args.output, "http_load", results, config)
+    print_table(results)
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        rows = compare(load_report(args.compare), report, LATENCY_METRICS + ("rps",),
+                       args.threshold, higher_is_better=("rps",))
+        print()
+        print(format_comparison(rows))
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
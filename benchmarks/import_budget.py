@@ -0,0 +1,126 @@
+"""
+Import-time budget check per entry point.
+
+Imports each entry point in a fresh interpreter and reports import wall
+time, peak RSS, the number of loaded modules and the slowest imports
+(from ``python -X importtime``). Exits with code 1 when an entry point
+goes over its budget or loads a module it must not load, e.g. the API
+pulling in python-pptx.
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --json benchmarks/results/imports.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> modules to import, budgets and modules that must stay unloaded
+ENTRY_POINTS: Dict[str, Dict] = {
+    "api": {
+        "imports": ["app.main"],
+        "max_import_seconds": 3.0,
+        "max_rss_mb": 150.0,
+        "forbidden": ["pptx", "PyPDF2", "openai", "celery_app.tasks", "app.ppt_generator"],
+    },
+    "worker": {
+        "imports": ["celery_app", "celery_app.tasks"],
+        "max_import_seconds": 4.0,
+        "max_rss_mb": 200.0,
+        "forbidden": [],
+    },
+}
+
+PROBE = """
+import json, os, resource, sys, time
+start = time.perf_counter()
+for name in {imports!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print("@@RESULT@@" + json.dumps({{
+    "import_seconds": elapsed,
+    "peak_rss_mb": rss_mb,
+    "module_count": len(sys.modules),
+    "loaded_forbidden": [m for m in {forbidden!r} if m in sys.modules],
+}}))
+"""
+
+
+def parse_importtime(stderr: str, top: int) -> List[Dict]:
+    """Top-level packages ranked by total self import time from ``-X importtime`` output"""
+    totals: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us = int(parts[0])
+        except ValueError:
+            continue  # header line
+        package = parts[2].strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"module": name, "self_ms": us / 1000.0} for name, us in ranked]
+
+
+def measure(name: str, spec: Dict, top: int) -> Dict:
+    code = PROBE.format(imports=spec["imports"], forbidden=spec["forbidden"])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    marker = [line for line in proc.stdout.splitlines() if line.startswith("@@RESULT@@")]
+    if proc.returncode or not marker:
+        raise RuntimeError(f"Importing {name} failed:\n{proc.stderr[-2000:]}")
+
+    result = json.loads(marker[0][len("@@RESULT@@"):])
+    result["slowest"] = parse_importtime(proc.stderr, top)
+    problems = []
+    if result["import_seconds"] > spec["max_import_seconds"]:
+        problems.append(f"import took {result['import_seconds']:.2f}s (budget {spec['max_import_seconds']}s)")
+    if result["peak_rss_mb"] > spec["max_rss_mb"]:
+        problems.append(f"peak RSS {result['peak_rss_mb']:.1f}MB (budget {spec['max_rss_mb']}MB)")
+    for module in result["loaded_forbidden"]:
+        problems.append(f"loads forbidden module '{module}'")
+    result["problems"] = problems
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS), help="Entry points to check")
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = False
+    for name in args.entry or sorted(ENTRY_POINTS):
+        result = results[name] = measure(name, ENTRY_POINTS[name], args.top)
+        status = "FAIL" if result["problems"] else "ok"
+        print(
+            f"[{status}] {name:<7} import {result['import_seconds']:6.2f}s  "
+            f"rss {result['peak_rss_mb']:7.1f}MB  modules {result['module_count']}"
+        )
+        for row in result["slowest"]:
+            print(f"          {row['module']:<24} {row['self_ms']:8.1f} ms")
+        for problem in result["problems"]:
+            print(f"          ! {problem}")
+        failed = failed or bool(result["problems"])
+
+    if args.json:
+        from benchmarks.report import write_report
+
+        write_report(args.json, "import_budget", results, {"entry_points": ENTRY_POINTS})
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Micro-benchmarks for the worker hot paths.
+
+- ``deck`` cases run ``PPTGenerator.generate_presentation`` on generated decks
+  of every ``SlideType`` (plus a mixed deck) at several sizes
+- ``pdf`` cases run ``PDFProcessor.extract_text_from_pdf`` on generated PDFs
+
+Every case runs in a fresh interpreter so peak RSS is per case. Wall time,
+CPU time, peak RSS and output size are recorded; with ``--baseline`` the run
+fails (exit code 1) when a tracked metric regresses past ``--threshold``.
+CPU time includes the case's child processes (large-deck chunk renderers),
+and ``child_peak_rss_mb`` is the peak combined RSS of the children running
+at the same time, sampled with psutil.
+
+    python -m benchmarks.render_bench --update-baseline
+    python -m benchmarks.render_bench --quick
+    python -m benchmarks.render_bench --require-baseline   # CI: a missing baseline fails
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.corpus import SLIDE_TYPES, make_deck, make_pdf
+from benchmarks.report import compare, format_comparison, load_report, write_report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DECK_SIZES = (5, 50, 200, 1000)
+PDF_PAGES = (1, 10, 100, 1000)
+QUICK_DECK_SIZES = (5, 50)
+QUICK_PDF_PAGES = (1, 10)
+
+TRACKED_METRICS = ("wall_s", "cpu_s", "peak_rss_mb", "child_peak_rss_mb", "output_bytes")
+# Absolute changes below these are treated as noise
+NOISE_FLOORS = {"wall_s": 0.02, "cpu_s": 0.02, "peak_rss_mb": 5.0, "child_peak_rss_mb": 5.0, "output_bytes": 1024}
+
+
+def _cpu_seconds(who=resource.RUSAGE_SELF) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class ChildRssSampler:
+    """
+    Peak combined RSS of this process's descendants, sampled from a thread.
+
+    RUSAGE_CHILDREN only reports the largest child ever waited for, counted
+    from process start, so it cannot show how much the chunk renderers use
+    together while a case runs.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        import psutil
+
+        process = psutil.Process()
+        while not self._stop.wait(self.interval):
+            total = 0
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_bytes = max(self.peak_bytes, total)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / (1024 * 1024)
+
+
+def _run_case(kind: str, payload, storage: str, queue):
+    """Child process entry point: run one case and report its measurements"""
+    os.environ["STORAGE_PATH"] = storage
+    os.environ["SPEC_PATH"] = os.path.join(storage, "specs")
+    sys.path.insert(0, ROOT)
+
+    if kind == "deck":
+        from app.models import PresentationRequest
+        from app.ppt_generator import PPTGenerator
+
+        # Image slides import httpx lazily; its one-off ldconfig probe is not rendering cost
+        import httpx  # noqa: F401
+
+        request = PresentationRequest(**payload)
+        generator = PPTGenerator()
+        run = lambda: generator.generate_presentation(request)
+    else:
+        from app.pdf_processor import PDFProcessor
+
+        with open(payload, "rb") as f:
+            pdf_content = f.read()
+        processor = PDFProcessor()
+        run = lambda: processor.extract_text_from_pdf(pdf_content)
+
+    rss_before = _peak_rss_mb()
+    cpu_start = _cpu_seconds()
+    children_cpu_start = _cpu_seconds(resource.RUSAGE_CHILDREN)
+    wall_start = time.perf_counter()
+    with ChildRssSampler() as children:
+        output = run()
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+    children_cpu = _cpu_seconds(resource.RUSAGE_CHILDREN) - children_cpu_start
+
+    if kind == "deck":
+        output_bytes = os.path.getsize(output)
+        os.unlink(output)
+    else:
+        output_bytes = len(output.encode("utf-8"))
+
+    queue.put({
+        "wall_s": wall,
+        "cpu_s": cpu + children_cpu,
+        "children_cpu_s": children_cpu,
+        "peak_rss_mb": _peak_rss_mb(),
+        "child_peak_rss_mb": children.peak_mb,
+        "rss_growth_mb": _peak_rss_mb() - rss_before,
+        "output_bytes": output_bytes,
+    })
+
+
+def measure(kind: str, payload, storage: str, repeat: int) -> Dict:
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_case, args=(kind, payload, storage, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        if process.exitcode:
+            raise RuntimeError(f"{kind} case failed with exit code {process.exitcode}")
+        runs.append(result)
+
+    return {
+        "wall_s": statistics.median(r["wall_s"] for r in runs),
+        "cpu_s": statistics.median(r["cpu_s"] for r in runs),
+        "children_cpu_s": statistics.median(r["children_cpu_s"] for r in runs),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+        "child_peak_rss_mb": max(r["child_peak_rss_mb"] for r in runs),
+        "rss_growth_mb": max(r["rss_growth_mb"] for r in runs),
+        "output_bytes": runs[-1]["output_bytes"],
+        "repeat": repeat,
+    }
+
+
+def build_cases(deck_sizes, pdf_pages, slide_types, workdir: str) -> List[Tuple[str, str, object]]:
+    cases = []
+    for n_slides in deck_sizes:
+        for slide_type in slide_types:
+            cases.append((f"deck/{slide_type}/{n_slides}", "deck", make_deck(n_slides, slide_type)))
+    for pages in pdf_pages:
+        path = os.path.join(workdir, f"corpus-{pages}.pdf")
+        with open(path, "wb") as f:
+            f.write(make_pdf(pages))
+        cases.append((f"pdf/{pages}", "pdf", path))
+    return cases
+
+
+def _sizes(text: str) -> Tuple[int, ...]:
+    return tuple(int(x) for x in text.split(",") if x)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deck-sizes", type=_sizes, help="Comma separated slide counts")
+    parser.add_argument("--pdf-pages", type=_sizes, help="Comma separated page counts")
+    parser.add_argument("--types", default=",".join(SLIDE_TYPES + ("mixed",)),
+                        help="Comma separated slide types to render")
+    parser.add_argument("--quick", action="store_true", help="Small sizes only, for local iteration")
+    parser.add_argument("--only", help="Run cases whose name contains this substring")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case (median wall/CPU, max RSS)")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results", "render.json"))
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "benchmarks", "baselines", "render.json"),
+                        help="Stored baseline to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Fail (exit code 1) when there is no baseline to compare against, e.g. in CI")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative regression that fails the run")
+    args = parser.parse_args(argv)
+
+    deck_sizes = args.deck_sizes or (QUICK_DECK_SIZES if args.quick else DECK_SIZES)
+    pdf_pages = args.pdf_pages or (QUICK_PDF_PAGES if args.quick else PDF_PAGES)
+    slide_types = [t for t in args.types.split(",") if t]
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="render-bench-") as workdir:
+        for name, kind, payload in build_cases(deck_sizes, pdf_pages, slide_types, workdir):
+            if args.only and args.only not in name:
+                continue
+            results[name] = row = measure(kind, payload, workdir, args.repeat)
+            print(
+                f"{name:<28} wall {row['wall_s']:8.3f}s  cpu {row['cpu_s']:8.3f}s  "
+                f"rss {row['peak_rss_mb']:8.1f}MB  child rss {row['child_peak_rss_mb']:8.1f}MB  "
+                f"out {row['output_bytes'] / 1024:10.1f}KB",
+                flush=True,
+            )
+
+    config = {"deck_sizes": deck_sizes, "pdf_pages": pdf_pages, "types": slide_types, "repeat": args.repeat}
+    report = write_report(args.output, "render", results, config)
+    print(f"\nReport written to {args.output}")
+
+    if args.update_baseline:
+        write_report(args.baseline, "render", results, config)
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 1 if args.require_baseline else 0
+
+    rows = compare(load_report(args.baseline), report, TRACKED_METRICS, args.threshold, floors=NOISE_FLOORS)
+    print()
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
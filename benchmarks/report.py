@@ -0,0 +1,112 @@
+"""
+Machine-readable benchmark reports.
+
+Reports are JSON documents with a ``meta`` block (commit, interpreter,
+host) and a ``results`` mapping of ``case -> {metric: value}`` so two
+runs can be compared metric by metric.
+"""
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+from typing import Dict, List, Optional, Sequence
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def write_report(path: str, suite: str, results: Dict[str, Dict], config: Dict) -> Dict:
+    report = {
+        "meta": {
+            "suite": suite,
+            "commit": git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": config,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return report
+
+
+def load_report(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, metrics: Sequence[str], threshold: float,
+            higher_is_better: Sequence[str] = (), floors: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    Compare two reports metric by metric.
+
+    Metrics are "lower is better" unless listed in ``higher_is_better``.
+    Returns one row per (case, metric) present in both reports; rows whose
+    relative change in the bad direction exceeds ``threshold`` are flagged
+    with ``regressed=True``. ``floors`` gives per-metric absolute deltas
+    below which a change is treated as noise; when the baseline value is 0
+    there is no relative change, and any worsening beyond the floor counts.
+    """
+    floors = floors or {}
+    rows = []
+    for case, values in current["results"].items():
+        old = baseline["results"].get(case)
+        if not old:
+            continue
+        for metric in metrics:
+            if metric not in values or metric not in old:
+                continue
+            before, after = old[metric], values[metric]
+            delta = after - before
+            worse_delta = -delta if metric in higher_is_better else delta
+            if before:
+                change = delta / before
+                worse = -change if metric in higher_is_better else change
+                regressed = worse > threshold and abs(delta) > floors.get(metric, 0.0)
+            else:
+                # No relative change from zero (e.g. a case that starts spawning children): the floor decides
+                change = math.copysign(math.inf, delta) if delta else 0.0
+                regressed = worse_delta > floors.get(metric, 0.0)
+            rows.append({
+                "case": case,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": change,
+                "regressed": regressed,
+            })
+    return rows
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'case':<40} {'metric':<14} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(
+            f"{row['case']:<40} {row['metric']:<14} {row['baseline']:>12.3f} "
+            f"{row['current']:>12.3f} {row['change']:>+7.1%}{flag}"
+        )
+    return "\n".join(lines)
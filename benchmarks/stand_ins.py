@@ -0,0 +1,118 @@
+"""
+Local stand-ins for the external services the API depends on.
+
+- ``local_redis``: a fakeredis TCP server, used when no real Redis URL is given
+- ``StubOpenAIServer``: answers ``/v1/chat/completions`` with a canned deck
+
+Both run in background threads of the benchmark process and bind to an
+ephemeral port on 127.0.0.1.
+"""
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_redis() -> Iterator[str]:
+    """Run an in-process fakeredis server and yield its URL"""
+    from fakeredis import TcpFakeServer
+
+    port = free_port()
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+STUB_DECK = {
+    "title": "Stub Presentation",
+    "slides": [
+        {"type": "title", "title": "Stub Presentation", "content": "Generated offline"},
+        {"type": "bullet_points", "title": "Highlights",
+         "bullet_points": ["First point", "Second point", "Third point"]},
+        {"type": "content", "title": "Summary", "content": "Canned response from the stub server."},
+    ],
+}
+
+
+class _StubOpenAIHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+        payload = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(STUB_DECK)},
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": 120,
+                "total_tokens": prompt_chars // 4 + 120,
+            },
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenAIServer:
+    """
+    Minimal OpenAI-compatible server.
+
+    Point clients at it with ``OPENAI_BASE_URL=<server.base_url>``.
+    ``latency`` simulates model response time in seconds.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        handler = type("Handler", (_StubOpenAIHandler,), {"latency": latency})
+        self.server = ThreadingHTTPServer(("127.0.0.1", free_port()), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "StubOpenAIServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
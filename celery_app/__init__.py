@@ -1,8 +1,15 @@
 from celery import Celery
 from app.config import settings
 
-app = Celery('presentation_generator')
+# Task names, so the API can enqueue with send_task without importing the
+# worker code (python-pptx, PyPDF2, openai)
+GENERATE_PRESENTATION_TASK = 'celery_app.tasks.generate_presentation_task'
+GENERATE_PRESENTATION_FROM_PDF_TASK = 'celery_app.tasks.generate_presentation_from_pdf_task'
+EDIT_PRESENTATION_TASK = 'celery_app.tasks.edit_presentation_task'
+
+# Tasks are imported by the worker at startup only
+app = Celery('presentation_generator', include=['celery_app.tasks'])
 app.config_from_object('celery_app.celery_config')
 
-# Import tasks to ensure they're registered
-from celery_app import tasks
\ No newline at end of file
+# Signal handlers run on both sides (publish hooks in the API, task hooks in the worker)
+from celery_app import signals
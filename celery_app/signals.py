@@ -0,0 +1,121 @@
+import os
+import time
+import logging
+from celery import signals
+from celery.concurrency import get_implementation
+from opentelemetry import context, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from app.config import settings
+from app import metrics
+from app.tracing import configure_tracing, extract_context, inject_headers, tracer
+
+logger = logging.getLogger(__name__)
+
+# task_id -> (span, context token) for tasks running in this process
+_task_spans = {}
+
+
+@signals.worker_ready.connect
+def start_metrics_exporter(**kwargs):
+    """Expose worker metrics for Prometheus from the main worker process"""
+    if not settings.WORKER_METRICS_PORT:
+        return
+    if not metrics.multiprocess_enabled():
+        logger.warning(
+            "PROMETHEUS_MULTIPROC_DIR is not set; metrics from prefork pool "
+            "processes will not be visible on the worker exporter"
+        )
+    try:
+        metrics.start_worker_exporter(settings.WORKER_METRICS_PORT)
+    except OSError as e:
+        logger.error(f"Could not start metrics exporter: {e}")
+
+
+@signals.worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    metrics.mark_process_dead(pid or os.getpid())
+
+
+# Pools whose processes announce themselves with worker_process_init
+_PROCESS_INIT_POOLS = ("celery.concurrency.prefork", "celery.concurrency.solo")
+
+
+@signals.worker_process_init.connect
+def setup_tracing(**kwargs):
+    """Each pool process installs its own provider and exporter after the fork"""
+    configure_tracing("presentation-worker")
+
+
+@signals.worker_init.connect
+def setup_tracing_in_main_process(sender=None, **kwargs):
+    """Thread and green pools run tasks in the main process, which gets no worker_process_init"""
+    pool = get_implementation(sender.pool_cls) if sender is not None else None
+    if pool is not None and pool.__module__ not in _PROCESS_INIT_POOLS:
+        configure_tracing("presentation-worker")
+
+
+@signals.before_task_publish.connect
+def propagate_trace_context(headers=None, **kwargs):
+    """Carry the publisher's trace context and publish time in the message headers"""
+    if headers is None:
+        return
+    inject_headers(headers)
+    headers.setdefault("published_at", time.time())
+
+
+@signals.task_prerun.connect
+def start_task_span(task_id=None, task=None, **kwargs):
+    span = tracer.start_span(
+        f"celery.task {task.name}",
+        context=extract_context(task.request),
+        kind=SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id, "celery.task_name": task.name},
+    )
+    published_at = getattr(task.request, "published_at", None)
+    if published_at:
+        span.set_attribute("messaging.queue_wait_seconds", max(0.0, time.time() - float(published_at)))
+    token = context.attach(trace.set_span_in_context(span))
+    _task_spans[task_id] = (span, token)
+
+
+@signals.task_postrun.connect
+def end_task_span(task_id=None, state=None, **kwargs):
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    span, token = entry
+    span.set_attribute("celery.state", state or "")
+    if state == "FAILURE":
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+    context.detach(token)
+
+
+@signals.task_failure.connect
+def record_task_exception(task_id=None, exception=None, **kwargs):
+    entry = _task_spans.get(task_id)
+    if entry and exception is not None:
+        entry[0].record_exception(exception)
+
+
+@signals.worker_init.connect
+def setup_profiling(**kwargs):
+    """Hook the sampling profiler into task execution only when it is enabled"""
+    if not settings.PROFILING_ENABLED:
+        return
+    from app.profiling import TaskProfiler
+
+    profiler = TaskProfiler()
+
+    def start_profile(task_id=None, **kw):
+        profiler.start(task_id)
+
+    def finish_profile(task_id=None, task=None, **kw):
+        profiler.finish(task_id, task.name, task.backend)
+
+    signals.task_prerun.connect(start_profile, weak=False)
+    signals.task_postrun.connect(finish_profile, weak=False)
+    logger.info(
+        f"Task profiling enabled (sample rate {settings.PROFILING_SAMPLE_RATE}, "
+        f"latency threshold {settings.PROFILING_LATENCY_THRESHOLD}s)"
+    )
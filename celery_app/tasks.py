@@ -1,13 +1,31 @@
 import os
 import logging
 from celery import shared_task
-from app.models import PresentationRequest
-from app.ppt_generator import PPTGenerator
+from app import history
+from app.deck_editor import DeckEditor
+from app.deck_store import deck_path, load_spec
+from app.metrics import STAGE_DURATION
+from app.models import PresentationRequest, SlideContent
+from app.pdf_processor import PDFProcessor
+from app.rendering import render_presentation
+from celery_app import GENERATE_PRESENTATION_TASK, GENERATE_PRESENTATION_FROM_PDF_TASK, EDIT_PRESENTATION_TASK
 
 logger = logging.getLogger(__name__)
 
-@shared_task(bind=True)
-def generate_presentation_task(self, request_dict):
+
+def _mark_failed(task, e: Exception):
+    logger.error(f"Error generating presentation: {str(e)}")
+    task.update_state(
+        state="FAILURE",
+        meta={
+            "status": "failed",
+            "message": f"Error: {str(e)}"
+        }
+    )
+
+
+@shared_task(bind=True, name=GENERATE_PRESENTATION_TASK)
+def generate_presentation_task(self, request_dict, owner=None):
     """Generate a PowerPoint presentation asynchronously"""
     try:
         # Convert dict back to PresentationRequest
@@ -16,25 +34,67 @@ def generate_presentation_task(self, request_dict):
         logger.info(f"Starting presentation generation for: {request.title}")
 
         # Generate the presentation
-        generator = PPTGenerator()
-        file_path = generator.generate_presentation(request)
+        return render_presentation(request, owner, self.request.id)
 
-        # In a real application, you might upload to S3 or similar
-        file_url = f"/download/{os.path.basename(file_path)}"
+    except Exception as e:
+        _mark_failed(self, e)
+        raise
+
+
+@shared_task(bind=True, name=GENERATE_PRESENTATION_FROM_PDF_TASK)
+def generate_presentation_from_pdf_task(self, pdf_text, request_dict, owner=None):
+    """Generate slide content from extracted PDF text with OpenAI, then render it"""
+    try:
+        logger.info(f"Starting PDF presentation generation for: {request_dict.get('title')}")
+
+        processor = PDFProcessor()
+        with STAGE_DURATION.labels("condense").time():
+            pdf_text = processor.condense_text(pdf_text)
+        with STAGE_DURATION.labels("llm").time():
+            content = processor.generate_presentation_content(
+                pdf_text,
+                title=request_dict.get("title"),
+                num_slides=request_dict.get("num_slides") or 5
+            )
+
+        request = PresentationRequest(
+            title=request_dict.get("title") or content.get("title", "Presentation"),
+            author=request_dict.get("author") or "Generated Presentation",
+            theme=request_dict.get("theme") or "default",
+            slides=content.get("slides", [])
+        )
+
+        return render_presentation(request, owner, self.request.id)
+
+    except Exception as e:
+        _mark_failed(self, e)
+        raise
+
+
+@shared_task(bind=True, name=EDIT_PRESENTATION_TASK)
+def edit_presentation_task(self, presentation_id, operation, index, slide_dict=None):
+    """Replace, insert or delete one slide of an existing deck"""
+    try:
+        logger.info(f"Editing presentation {presentation_id}: {operation} slide {index}")
+
+        slide = SlideContent(**slide_dict) if slide_dict is not None else None
+        changed = DeckEditor(presentation_id).apply(operation, index, slide)
+        if changed and history.enabled():
+            try:
+                history.update(presentation_id, {
+                    "slide_count": len(load_spec(presentation_id).slides),
+                    "size_bytes": os.path.getsize(deck_path(presentation_id)),
+                })
+            except Exception as e:
+                logger.warning(f"Could not update presentation history: {e}")
 
         return {
             "status": "completed",
-            "file_url": file_url,
-            "message": "Presentation generated successfully"
+            "file_url": f"/download/{presentation_id}.pptx",
+            "presentation_id": presentation_id,
+            "message": "Presentation updated successfully" if changed else "No changes"
         }
 
     except Exception as e:
-        logger.error(f"Error generating presentation: {str(e)}")
-        self.update_state(
-            state="FAILURE",
-            meta={
-                "status": "failed",
-                "message": f"Error: {str(e)}"
-            }
-        )
+        _mark_failed(self, e)
         raise
@@ -0,0 +1,161 @@
+"""
+ImageFetcher against a local HTTP server: fetching, cache hits, downscaling,
+revalidation and cache eviction.
+"""
+import base64
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app import image_fetcher
+from app.image_fetcher import ImageCache, ImageFetcher
+
+
+def make_png(width: int, height: int, color=(200, 30, 30)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class ImageServer:
+    """Serves ``images[path]`` with an ETag and answers If-None-Match with 304"""
+
+    def __init__(self):
+        self.images = {}
+        self.redirects = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.path in server.redirects:
+                    self.send_response(302)
+                    self.send_header("Location", server.redirects[self.path])
+                    self.end_headers()
+                    return
+                data = server.images.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hash(data)}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # The test server listens on loopback, which is refused by default
+    monkeypatch.setattr(settings, "IMAGE_ALLOW_PRIVATE_HOSTS", True)
+    with ImageServer() as s:
+        yield s
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return ImageFetcher(ImageCache(root=str(tmp_path / "cache")))
+
+
+def test_fetches_concurrently_and_serves_repeats_from_cache(server, fetcher):
+    server.images = {f"/{i}.png": make_png(40, 30, (i, 0, 0)) for i in range(5)}
+    urls = [f"{server.base_url}/{i}.png" for i in range(5)]
+
+    images = fetcher.fetch_all(urls + [f"{server.base_url}/missing.png"])
+    assert [(images[u].width, images[u].height) for u in urls] == [(40, 30)] * 5
+    assert images[f"{server.base_url}/missing.png"] is None
+    assert len(server.requests) == 6
+
+    again = fetcher.fetch_all(urls)
+    assert len(server.requests) == 6
+    assert [again[u].data for u in urls] == [images[u].data for u in urls]
+
+
+def test_downscales_large_images(server, fetcher):
+    server.images = {"/large.png": make_png(4000, 3000)}
+    image = fetcher.fetch_all([f"{server.base_url}/large.png"])[f"{server.base_url}/large.png"]
+
+    assert (image.width, image.height) == (settings.IMAGE_MAX_WIDTH, settings.IMAGE_MAX_WIDTH * 3 // 4)
+    assert Image.open(io.BytesIO(image.data)).format == "JPEG"
+
+
+def test_stale_entries_are_revalidated(server, fetcher, monkeypatch):
+    url = f"{server.base_url}/logo.png"
+    server.images = {"/logo.png": make_png(20, 20)}
+    first = fetcher.fetch_all([url])[url]
+
+    monkeypatch.setattr(settings, "IMAGE_CACHE_TTL", 1e-9)
+    assert fetcher.fetch_all([url])[url].data == first.data
+    assert server.requests[-1][1] is not None  # conditional request, answered 304
+
+    server.images = {"/logo.png": make_png(20, 20, (0, 0, 255))}
+    changed = fetcher.fetch_all([url])[url]
+    assert changed.data != first.data
+
+
+def test_evict_bounds_blobs_and_source_entries(tmp_path):
+    cache = ImageCache(root=str(tmp_path / "cache"), max_bytes=40_000)
+    fetcher = ImageFetcher(cache)
+    for _ in range(20):
+        noise = Image.frombytes("RGB", (64, 64), os.urandom(64 * 64 * 3))
+        buffer = io.BytesIO()
+        noise.save(buffer, format="PNG")
+        fetcher.fetch_all([f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"])
+
+    files = [os.path.join(d, n) for d in (cache.blob_dir, cache.source_dir) for n in os.listdir(d)]
+    assert sum(os.path.getsize(f) for f in files) <= 40_000
+    blobs = set(os.listdir(cache.blob_dir))
+    assert 0 < len(os.listdir(cache.source_dir)) <= len(blobs) < 20
+    for name in os.listdir(cache.source_dir):
+        with open(os.path.join(cache.source_dir, name)) as f:
+            assert json.load(f)["blob"] in blobs
+
+
+def test_private_hosts_are_refused(server, fetcher, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_ALLOW_PRIVATE_HOSTS", False)
+    server.images = {"/secret.png": make_png(10, 10)}
+    urls = [f"{server.base_url}/secret.png", "http://169.254.169.254/latest/meta-data/", "http://localhost/x.png"]
+
+    assert fetcher.fetch_all(urls) == dict.fromkeys(urls)
+    assert server.requests == []
+
+
+def test_redirects_are_checked_on_every_hop(server, fetcher, monkeypatch):
+    # Treat the loopback test server as public, link-local as internal
+    monkeypatch.setattr(settings, "IMAGE_ALLOW_PRIVATE_HOSTS", False)
+    monkeypatch.setattr(image_fetcher, "_blocked_address", lambda ip: ip.is_link_local)
+    server.images = {"/ok.png": make_png(10, 10)}
+    server.redirects = {"/moved.png": "/ok.png", "/metadata.png": "http://169.254.169.254/latest/meta-data/"}
+
+    images = fetcher.fetch_all([f"{server.base_url}/moved.png", f"{server.base_url}/metadata.png"])
+    assert images[f"{server.base_url}/moved.png"].width == 10
+    assert images[f"{server.base_url}/metadata.png"] is None
+    assert sorted(path for path, _ in server.requests) == ["/metadata.png", "/moved.png", "/ok.png"]
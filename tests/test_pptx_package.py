@@ -0,0 +1,126 @@
+"""
+PackageEditor against decks rendered by PPTGenerator: replacing, inserting
+and deleting slides, media pruning and the large-deck chunk merge.
+
+The editor copies zip entries raw through ZipFile internals, so every output
+is checked with ``testzip`` (CRCs of all entries) and reopened by python-pptx.
+"""
+import base64
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+
+from app.config import settings
+from app.models import PresentationRequest, SlideContent, SlideType
+from app.ppt_generator import PPTGenerator
+from app.pptx_package import PackageEditor, PptxPackage
+
+
+def image_url(color) -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 24), color).save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def content(title: str) -> SlideContent:
+    return SlideContent(type=SlideType.CONTENT, title=title, content=f"Body of {title}")
+
+
+def picture(title: str, color) -> SlideContent:
+    return SlideContent(type=SlideType.IMAGE, title=title, image_url=image_url(color))
+
+
+def titles(path) -> list:
+    return [slide.shapes.title.text for slide in Presentation(str(path)).slides]
+
+
+def media(path) -> list:
+    with zipfile.ZipFile(path) as z:
+        return sorted(n for n in z.namelist() if n.startswith("ppt/media/"))
+
+
+def check_package(path):
+    with zipfile.ZipFile(path) as z:
+        assert z.testzip() is None
+    return titles(path)
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path / "storage"))
+    monkeypatch.setattr(settings, "SPEC_PATH", str(tmp_path / "specs"))
+    monkeypatch.setattr(settings, "IMAGE_CACHE_PATH", str(tmp_path / "cache"))
+    return PPTGenerator()
+
+
+@pytest.fixture
+def deck(generator):
+    request = PresentationRequest(title="Deck", author="Tests", slides=[
+        content("One"), picture("Red", (255, 0, 0)), content("Three"), picture("Blue", (0, 0, 255)),
+    ])
+    return generator.generate_presentation(request)
+
+
+def edit(path, output, *operations):
+    with PackageEditor(str(path)) as editor:
+        for operation in operations:
+            operation(editor)
+        editor.save(str(output))
+    return check_package(output)
+
+
+def test_replace_insert_and_delete(generator, deck, tmp_path):
+    new = PptxPackage(generator.render_slides([content("New")]))
+    try:
+        assert edit(deck, tmp_path / "replaced.pptx", lambda e: e.replace_slide(1, new)) == [
+            "Deck", "New", "Red", "Three", "Blue"
+        ]
+        assert edit(deck, tmp_path / "inserted.pptx", lambda e: e.insert_slide(0, new),
+                    lambda e: e.insert_slide(6, new)) == ["New", "Deck", "One", "Red", "Three", "Blue", "New"]
+        assert edit(deck, tmp_path / "deleted.pptx", lambda e: e.delete_slide(3),
+                    lambda e: e.delete_slide(0)) == ["One", "Red", "Blue"]
+    finally:
+        new.close()
+
+    # Edits chain: the output of one edit is a valid source for the next
+    assert edit(tmp_path / "inserted.pptx", tmp_path / "chained.pptx",
+                lambda e: e.delete_slide(6), lambda e: e.delete_slide(0)) == titles(deck)
+
+    with PackageEditor(deck) as editor, pytest.raises(IndexError):
+        editor.delete_slide(len(editor))
+
+
+def test_media_of_removed_slides_is_pruned(generator, deck, tmp_path):
+    red, blue = media(deck)
+
+    assert edit(deck, tmp_path / "deleted.pptx", lambda e: e.delete_slide(2)) == ["Deck", "One", "Three", "Blue"]
+    assert media(tmp_path / "deleted.pptx") == [blue]
+
+    text = PptxPackage(generator.render_slides([content("Text")]))
+    green = PptxPackage(generator.render_slides([picture("Green", (0, 255, 0))]))
+    try:
+        edit(deck, tmp_path / "replaced.pptx", lambda e: e.replace_slide(4, text))
+        assert media(tmp_path / "replaced.pptx") == [red]
+
+        # A picture still used by another slide stays; the imported one is added once
+        edit(deck, tmp_path / "shared.pptx", lambda e: e.insert_slide(1, green),
+             lambda e: e.insert_slide(1, green), lambda e: e.delete_slide(1))
+    finally:
+        text.close()
+        green.close()
+    shared = media(tmp_path / "shared.pptx")
+    assert len(shared) == 3 and {red, blue} < set(shared)
+    assert titles(tmp_path / "shared.pptx") == ["Deck", "Green", "One", "Red", "Three", "Blue"]
+
+
+def test_large_deck_chunks_are_merged(generator, monkeypatch):
+    monkeypatch.setattr(settings, "LARGE_DECK_THRESHOLD", 10)
+    monkeypatch.setattr(settings, "LARGE_DECK_CHUNK_SIZE", 10)
+    monkeypatch.setattr(settings, "LARGE_DECK_PROCESSES", 2)
+    slides = [content(f"Slide {i}") for i in range(45)]
+
+    path = generator.generate_presentation(PresentationRequest(title="Large", author="Tests", slides=slides))
+    assert check_package(path) == ["Large"] + [f"Slide {i}" for i in range(45)]
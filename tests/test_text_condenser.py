@@ -0,0 +1,61 @@
+"""
+condense: boilerplate removal keeps real content, and the output fits the budget.
+"""
+from app.text_condenser import condense, count_tokens
+
+MODEL = "gpt-4o"
+
+
+def document(pages: int) -> str:
+    return "\f".join(
+        f"Annual Report 2023 | {page}\n"
+        f"Chapter {page}\n"
+        f"Section {page} discusses topic number {page} in some detail.\n"
+        f"It continues with a second sentence about item {page * 7}.\n"
+        f"Confidential - do not distribute\n"
+        f"{page}"
+        for page in range(1, pages + 1)
+    )
+
+
+def test_running_headers_and_footers_are_dropped():
+    result = condense(document(6), 8000, MODEL)
+
+    assert "Annual Report" not in result.text
+    assert "Confidential" not in result.text
+    assert result.boilerplate_lines == 12
+    for page in range(1, 7):
+        assert f"Chapter {page}" in result.text
+        assert f"Section {page} discusses topic number {page}" in result.text
+
+
+def test_repeated_lines_inside_pages_are_content():
+    # Lines that differ only in their numbers, or repeat mid-page, are not headers
+    text = "\f".join(
+        f"Intro {n}\nItem {n} costs {n + 4} dollars\nFirst point {n}.\nSecond point {n}.\n"
+        f"See the appendix.\nThird point {n}.\nFourth point {n}.\nClosing {n}\nEnd {n}"
+        for n in range(1, 5)
+    )
+    result = condense(text, 8000, MODEL)
+
+    assert result.boilerplate_lines == 0
+    assert all(f"Item {n} costs {n + 4} dollars" in result.text for n in range(1, 5))
+    assert result.text.count("See the appendix.") == 4
+
+
+def test_short_pages_keep_their_only_lines():
+    result = condense("Item 1 costs 5 dollars\fItem 2 costs 6 dollars\fItem 3 costs 7 dollars", 8000, MODEL)
+    assert result.text == "Item 1 costs 5 dollars\n\nItem 2 costs 6 dollars\n\nItem 3 costs 7 dollars"
+
+    # Pages that are nothing but the same line still yield that line
+    result = condense("Thank you\fThank you\fThank you", 8000, MODEL)
+    assert result.text == "Thank you"
+    assert result.boilerplate_lines == 0
+
+
+def test_output_fits_the_budget():
+    result = condense(document(200), 300, MODEL)
+
+    assert 0 < result.output_tokens <= 300
+    assert count_tokens(result.text, MODEL) == result.output_tokens
+    assert result.passages_kept < result.passages_total